@@ -0,0 +1,234 @@
+import argparse
+import gc
+import itertools
+import json
+import platform
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from comum import CAMINHO_PADRAO, carregar_modulo
+
+PLATAFORMAS = ['PC', 'PlayStation', 'Xbox', 'Switch']
+CATEGORIAS = ['Ação', 'RPG', 'Estratégia', 'Esporte', 'Corrida', 'Puzzle', 'Aventura', 'Simulação']
+PROMOCOES = [None, None, None, 'lançamento', 'fim de ano']
+
+
+class GeradorCarga:
+    def __init__(self, clientes, jogos=None, empresas=None, expoente=1.1, semente=0):
+        self.clientes = clientes
+        self.jogos = jogos or max(10, clientes // 10)
+        self.empresas = empresas or max(1, self.jogos // 50)
+        self.aleatorio = random.Random(semente)
+        self._pesos_jogos = list(itertools.accumulate(1 / (posicao ** expoente) for posicao in range(1, self.jogos + 1)))
+        self._pesos_clientes = list(itertools.accumulate(1 / (posicao ** 0.8) for posicao in range(1, self.clientes + 1)))
+
+    @staticmethod
+    def cnpj(indice):
+        return f'{indice:014d}'
+
+    @staticmethod
+    def cpf(indice):
+        return f'{indice:011d}'
+
+    @staticmethod
+    def jogo(indice):
+        return f'Jogo {indice}'
+
+    def empresas_sinteticas(self):
+        for i in range(self.empresas):
+            yield f'Editora {i}', self.cnpj(i)
+
+    def jogos_sinteticos(self):
+        aleatorio = self.aleatorio
+        for i in range(self.jogos):
+            yield (self.cnpj(i % self.empresas), self.jogo(i), round(aleatorio.uniform(5, 300), 2),
+                   aleatorio.choice(PLATAFORMAS), aleatorio.choice(CATEGORIAS), aleatorio.choice(PROMOCOES))
+
+    def clientes_sinteticos(self):
+        aleatorio = self.aleatorio
+        for i in range(self.clientes):
+            yield f'Cliente {i}', self.cpf(i), aleatorio.randint(18, 80), round(aleatorio.lognormvariate(6.5, 0.5), 2)
+
+    def compras(self, quantidade):
+        jogos = self.aleatorio.choices(range(self.jogos), cum_weights=self._pesos_jogos, k=quantidade)
+        clientes = self.aleatorio.choices(range(self.clientes), cum_weights=self._pesos_clientes, k=quantidade)
+        return [(self.cpf(cliente), self.jogo(jogo)) for cliente, jogo in zip(clientes, jogos)]
+
+
+def montar_loja(modulo, gerador):
+    loja = modulo.Loja(saida=modulo.SaidaNula())
+    for nome, cnpj in gerador.empresas_sinteticas():
+        loja.cadastrar_empresa(nome, cnpj)
+    for cnpj, nome, preco, plataforma, categoria, promocao in gerador.jogos_sinteticos():
+        loja.cadastrar_produto(cnpj, nome, preco, plataforma, categoria, promocao)
+    for nome, cpf, idade, saldo in gerador.clientes_sinteticos():
+        loja.cadastrar_cliente(nome, cpf, idade)
+        loja.adicionar_saldo(cpf, saldo)
+    return loja
+
+
+def percentil(ordenadas, fracao):
+    if not ordenadas:
+        return 0
+    return ordenadas[min(len(ordenadas) - 1, int(fracao * len(ordenadas)))]
+
+
+def cronometrar(modulo, chamadas):
+    duracoes = []
+    erros = 0
+    relogio = time.perf_counter_ns
+    for funcao, argumentos in chamadas:
+        inicio = relogio()
+        try:
+            funcao(*argumentos)
+        except modulo.ErroLoja:
+            erros += 1
+        duracoes.append(relogio() - inicio)
+    total = sum(duracoes)
+    duracoes.sort()
+    return {
+        'operacoes': len(duracoes),
+        'erros': erros,
+        'ops_por_segundo': len(duracoes) / (total / 1e9) if total else 0.0,
+        'latencia_us': {
+            'p50': percentil(duracoes, 0.50) / 1e3,
+            'p90': percentil(duracoes, 0.90) / 1e3,
+            'p99': percentil(duracoes, 0.99) / 1e3,
+            'max': duracoes[-1] / 1e3 if duracoes else 0.0,
+        },
+    }
+
+
+def cenarios(loja, gerador, repeticoes):
+    aleatorio = gerador.aleatorio
+    cpfs = [gerador.cpf(i) for i in aleatorio.sample(range(gerador.clientes), min(repeticoes, gerador.clientes))]
+    novos = [(f'Novo {i}', f'9{i:010d}', 30) for i in range(repeticoes)]
+    editoras = [(f'Nova Editora {i}', f'8{i:013d}') for i in range(repeticoes)]
+    extras = [(gerador.cnpj(i % gerador.empresas), f'Extra {i}', 19.9) for i in range(repeticoes)]
+    paginas = max(1, gerador.jogos // 20)
+    lotes = [gerador.compras(8) for _ in range(max(1, repeticoes // 8))]
+
+    yield 'cadastrar_empresa', [(loja.cadastrar_empresa, argumentos) for argumentos in editoras]
+    yield 'editar_empresa', [(loja.editar_empresa, (cnpj, f'Renomeada {cnpj}')) for _, cnpj in editoras]
+    yield 'excluir_empresa', [(loja.excluir_empresa, (cnpj,)) for _, cnpj in editoras]
+    yield 'cadastrar_cliente', [(loja.cadastrar_cliente, argumentos) for argumentos in novos]
+    yield 'editar_cliente', [(loja.editar_cliente, (cpf, f'Renomeado {cpf}', None)) for _, cpf, _ in novos]
+    yield 'excluir_cliente', [(loja.excluir_cliente, (cpf,)) for _, cpf, _ in novos]
+    yield 'cadastrar_produto', [(loja.cadastrar_produto, argumentos) for argumentos in extras]
+    yield 'editar_produto', [(loja.editar_produto, (cnpj, nome, None, 24.9)) for cnpj, nome, _ in extras]
+    yield 'excluir_produto', [(loja.excluir_produto, (cnpj, nome)) for cnpj, nome, _ in extras]
+    yield 'comprar_jogo', [(loja.comprar_jogo, compra) for compra in gerador.compras(repeticoes)]
+    yield 'comprar_jogos_em_lote', [(loja.comprar_jogos_em_lote, (lote,)) for lote in lotes]
+    yield 'listar_produto', [(loja.listar_produto, (20 * aleatorio.randrange(paginas), 20)) for _ in range(repeticoes)]
+    yield 'listar_empresa', [(loja.listar_empresa, (aleatorio.randrange(gerador.empresas), 20)) for _ in range(repeticoes)]
+    yield 'listar_cliente', [(loja.listar_cliente, (aleatorio.randrange(gerador.clientes), 20)) for _ in range(repeticoes)]
+    yield 'historico_cliente', [(loja.historico_cliente, (cpf,)) for cpf in cpfs]
+    yield 'exibir_historico_cliente', [(loja.exibir_historico_cliente, (cpf,)) for cpf in cpfs]
+    yield 'exibir_jogos_comprados', [(loja.exibir_jogos_comprados, (cpf,)) for cpf in cpfs]
+    yield 'buscar_jogos', [(loja.buscar_jogos, (f'jogo {aleatorio.randrange(gerador.jogos)}',)) for _ in range(repeticoes)]
+    yield 'relatorio_financeiro', [(loja.relatorio_financeiro, ()) for _ in range(max(1, repeticoes // 100))]
+    yield 'exibir_relatorio_financeiro', [(loja.exibir_relatorio_financeiro, ()) for _ in range(max(1, repeticoes // 100))]
+    yield 'relatorio_por_empresa', [(loja.relatorio_financeiro, ('empresa',)) for _ in range(max(1, repeticoes // 100))]
+    yield 'mais_vendidos', [(loja.mais_vendidos, (100,)) for _ in range(max(1, repeticoes // 10))]
+    yield 'mais_vendidos_receita', [(loja.mais_vendidos, (100, 'produto', 'receita')) for _ in range(max(1, repeticoes // 10))]
+
+
+def medir_escala(modulo, clientes, compras_iniciais, repeticoes, semente):
+    gerador = GeradorCarga(clientes, semente=semente)
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    loja = montar_loja(modulo, gerador)
+    montagem = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    loja.comprar_jogos_em_lote(gerador.compras(compras_iniciais))
+    carga = time.perf_counter() - inicio
+    memoria_atual, memoria_pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    resultado = {
+        'clientes': gerador.clientes,
+        'jogos': gerador.jogos,
+        'empresas': gerador.empresas,
+        'vendas_iniciais': len(loja.historico),
+        'montagem_s': montagem,
+        'carga_compras_s': carga,
+        'memoria_bytes': memoria_atual,
+        'memoria_pico_bytes': memoria_pico,
+        'operacoes': {},
+    }
+    for nome, chamadas in cenarios(loja, gerador, repeticoes):
+        resultado['operacoes'][nome] = cronometrar(modulo, chamadas)
+    return resultado
+
+
+def comparar(atual, anterior, tolerancia):
+    regressoes = []
+    escalas_anteriores = {escala['clientes']: escala for escala in anterior['escalas']}
+    for escala in atual['escalas']:
+        base = escalas_anteriores.get(escala['clientes'])
+        if base is None:
+            continue
+        for nome, medida in escala['operacoes'].items():
+            referencia = base['operacoes'].get(nome)
+            if not referencia or not referencia['ops_por_segundo']:
+                continue
+            razao = medida['ops_por_segundo'] / referencia['ops_por_segundo']
+            if razao < 1 - tolerancia:
+                regressoes.append((escala['clientes'], nome, referencia['ops_por_segundo'], medida['ops_por_segundo']))
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera lojas sintéticas e mede vazão, latência e memória por operação.')
+    parser.add_argument('--caminho', default=CAMINHO_PADRAO)
+    parser.add_argument('--escalas', default='1000,10000,100000', help='quantidades de clientes separadas por vírgula')
+    parser.add_argument('--compras', type=float, default=2.0, help='compras iniciais por cliente')
+    parser.add_argument('--repeticoes', type=int, default=2000, help='chamadas cronometradas por operação')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', help='arquivo JSON com os resultados')
+    parser.add_argument('--comparar', help='resultado JSON anterior para detectar regressões')
+    parser.add_argument('--tolerancia', type=float, default=0.20, help='queda relativa de ops/s aceita na comparação')
+    args = parser.parse_args()
+
+    modulo = carregar_modulo(args.caminho)
+    resultado = {
+        'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'plataforma': platform.platform(),
+        'parametros': vars(args),
+        'escalas': [],
+    }
+    for clientes in (int(escala) for escala in args.escalas.split(',')):
+        escala = medir_escala(modulo, clientes, int(clientes * args.compras), args.repeticoes, args.semente)
+        resultado['escalas'].append(escala)
+        print(f'\n{clientes} clientes, {escala["jogos"]} jogos, {escala["empresas"]} empresas: '
+              f'montagem {escala["montagem_s"]:.2f}s, {escala["vendas_iniciais"]} vendas em {escala["carga_compras_s"]:.2f}s, '
+              f'pico {escala["memoria_pico_bytes"] / 2 ** 20:.1f} MiB')
+        print(f'{"Operação":<26} {"ops/s":>12} {"p50 µs":>9} {"p90 µs":>9} {"p99 µs":>9} {"erros":>6}')
+        for nome, medida in escala['operacoes'].items():
+            latencia = medida['latencia_us']
+            print(f'{nome:<26} {medida["ops_por_segundo"]:>12,.0f} {latencia["p50"]:>9.1f} '
+                  f'{latencia["p90"]:>9.1f} {latencia["p99"]:>9.1f} {medida["erros"]:>6}')
+    resultado['rss_maximo_kib'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            anterior = json.load(arquivo)
+        regressoes = comparar(resultado, anterior, args.tolerancia)
+        for clientes, nome, antes, depois in regressoes:
+            print(f'REGRESSÃO {clientes} clientes / {nome}: {antes:,.0f} -> {depois:,.0f} ops/s')
+        if regressoes:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
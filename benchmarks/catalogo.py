@@ -0,0 +1,101 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from comum import RAIZ, carregar_modulo
+
+LEITOR = '''
+import json, random, sys, time
+import loja
+modo, caminho, nomes, consultas = sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+inicio = time.perf_counter()
+if modo == 'objetos':
+    fonte = loja.Loja(caminho, saida=loja.SaidaNula())
+    preco = lambda nome: fonte.buscar_produto(nome).aplicar_promocao()
+else:
+    fonte = loja.CatalogoMapeado(caminho)
+    preco = fonte.preco
+abertura = time.perf_counter() - inicio
+aleatorio = random.Random(0)
+amostra = [f'Jogo {aleatorio.randrange(nomes)}' for _ in range(consultas)]
+inicio = time.perf_counter()
+for nome in amostra:
+    preco(nome)
+duracao = time.perf_counter() - inicio
+memoria = {'Rss:': None, 'Pss:': None}
+try:
+    with open('/proc/self/smaps_rollup') as arquivo:
+        for linha in arquivo:
+            if linha.split(' ', 1)[0] in memoria:
+                memoria[linha.split(' ', 1)[0]] = int(linha.split()[1])
+except OSError:
+    pass
+print(json.dumps({'abertura_s': abertura, 'consultas_por_s': consultas / duracao,
+                  'rss_kib': memoria['Rss:'], 'pss_kib': memoria['Pss:']}))
+'''
+
+
+def preparar(modulo, diretorio, empresas, produtos):
+    loja = modulo.Loja(diretorio, intervalo_snapshot=float('inf'), saida=modulo.SaidaNula())
+    for i in range(empresas):
+        loja.cadastrar_empresa(f'Editora {i}', f'{i:014d}')
+    for i in range(produtos):
+        loja.cadastrar_produto(f'{i % empresas:014d}', f'Jogo {i}', 5 + i % 300, 'PC', f'Categoria {i % 8}',
+                               'lançamento' if i % 10 == 0 else None)
+    loja.salvar_snapshot()
+    caminho = os.path.join(diretorio, 'catalogo.bin')
+    inicio = time.perf_counter()
+    loja.exportar_catalogo(caminho)
+    exportacao = time.perf_counter() - inicio
+    loja.fechar()
+    return caminho, exportacao
+
+
+def medir_leitores(modo, caminho, processos, produtos, consultas):
+    comando = [sys.executable, '-c', LEITOR, modo, caminho, str(produtos), str(consultas)]
+    leitores = [subprocess.Popen(comando, cwd=RAIZ, stdout=subprocess.PIPE, text=True) for _ in range(processos)]
+    medidas = [json.loads(leitor.communicate()[0]) for leitor in leitores]
+    return {
+        'abertura_s': max(medida['abertura_s'] for medida in medidas),
+        'consultas_por_s': sum(medida['consultas_por_s'] for medida in medidas) / len(medidas),
+        'rss_kib': None if medidas[0]['rss_kib'] is None else sum(medida['rss_kib'] for medida in medidas),
+        'pss_kib': None if medidas[0]['pss_kib'] is None else sum(medida['pss_kib'] for medida in medidas),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara leitores com objetos próprios e leitores do catálogo mapeado.')
+    parser.add_argument('--empresas', type=int, default=100)
+    parser.add_argument('--produtos', type=int, default=200000)
+    parser.add_argument('--processos', type=int, default=4)
+    parser.add_argument('--consultas', type=int, default=200000)
+    parser.add_argument('--saida', help='arquivo JSON com os resultados')
+    args = parser.parse_args()
+
+    modulo = carregar_modulo()
+    resultado = {'parametros': vars(args), 'leitores': {}}
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho, exportacao = preparar(modulo, diretorio, args.empresas, args.produtos)
+        resultado['exportacao_s'] = exportacao
+        resultado['catalogo_bytes'] = os.path.getsize(caminho)
+        resultado['snapshot_bytes'] = os.path.getsize(os.path.join(diretorio, 'snapshot.json'))
+        print(f'{args.produtos} produtos: catálogo de {resultado["catalogo_bytes"] / 2 ** 20:.1f} MiB exportado em '
+              f'{exportacao:.2f}s (snapshot JSON {resultado["snapshot_bytes"] / 2 ** 20:.1f} MiB)')
+        print(f'{"Leitores":<10} {"abertura s":>11} {"consultas/s":>12} {"RSS total MiB":>14} {"PSS total MiB":>14}')
+        for modo, fonte in (('objetos', diretorio), ('mapeado', caminho)):
+            medida = medir_leitores(modo, fonte, args.processos, args.produtos, args.consultas)
+            resultado['leitores'][modo] = medida
+            rss, pss = ('-' if medida[chave] is None else f'{medida[chave] / 1024:.1f}' for chave in ('rss_kib', 'pss_kib'))
+            print(f'{modo:<10} {medida["abertura_s"]:>11.3f} {medida["consultas_por_s"]:>12,.0f} {rss:>14} {pss:>14}')
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
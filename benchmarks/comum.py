@@ -0,0 +1,18 @@
+import importlib
+import importlib.util
+import os
+import sys
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+CAMINHO_PADRAO = None
+
+
+def carregar_modulo(caminho=CAMINHO_PADRAO):
+    if caminho is None:
+        if RAIZ not in sys.path:
+            sys.path.insert(0, RAIZ)
+        return importlib.import_module('loja')
+    spec = importlib.util.spec_from_file_location('codigo_final', caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
@@ -0,0 +1,85 @@
+import argparse
+import random
+import time
+from array import array
+from decimal import Decimal, ROUND_HALF_UP
+
+from comum import CAMINHO_PADRAO, carregar_modulo
+
+CENTAVO = Decimal('0.01')
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def precos_float(precos, taxa, desconto):
+    return [preco * (1 + taxa) * (1 - desconto) for preco in precos]
+
+
+def precos_decimal(precos, taxa, desconto):
+    fator_taxa = 1 + Decimal(str(taxa))
+    fator_desconto = 1 - Decimal(str(desconto))
+    return [((preco * fator_taxa).quantize(CENTAVO, ROUND_HALF_UP) * fator_desconto).quantize(CENTAVO, ROUND_HALF_UP)
+            for preco in precos]
+
+
+def precos_centavos(modulo, precos, taxa, desconto):
+    fator_taxa = modulo.PONTOS_BASE + modulo.em_pontos_base(taxa)
+    fator_desconto = modulo.PONTOS_BASE - modulo.em_pontos_base(desconto)
+    aplicar = modulo.aplicar_pontos_base
+    return [aplicar(aplicar(preco, fator_taxa), fator_desconto) for preco in precos]
+
+
+def acumular(valores, inicial):
+    total = inicial
+    for valor in valores:
+        total += valor
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara float, Decimal e centavos inteiros no cálculo de preços e totais.')
+    parser.add_argument('--caminho', default=CAMINHO_PADRAO)
+    parser.add_argument('-n', '--vendas', type=int, default=1000000)
+    parser.add_argument('--taxa', type=float, default=0.30)
+    parser.add_argument('--desconto', type=float, default=0.20)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    modulo = carregar_modulo(args.caminho)
+    aleatorio = random.Random(args.semente)
+    centavos = [aleatorio.randint(99, 29999) for _ in range(args.vendas)]
+    reais_float = [valor / 100 for valor in centavos]
+    reais_decimal = [Decimal(valor).scaleb(-2) for valor in centavos]
+
+    tempo_float, final_float = cronometrar(lambda: precos_float(reais_float, args.taxa, args.desconto))
+    tempo_decimal, final_decimal = cronometrar(lambda: precos_decimal(reais_decimal, args.taxa, args.desconto))
+    tempo_centavos, final_centavos = cronometrar(lambda: precos_centavos(modulo, centavos, args.taxa, args.desconto))
+    divergentes = sum(1 for decimal, inteiro in zip(final_decimal, final_centavos) if int(decimal.scaleb(2)) != inteiro)
+
+    soma_float, total_float = cronometrar(lambda: acumular(final_float, 0.0))
+    soma_decimal, total_decimal = cronometrar(lambda: acumular(final_decimal, Decimal(0)))
+    soma_centavos, total_centavos = cronometrar(lambda: acumular(final_centavos, 0))
+    coluna_float, coluna_centavos = array('d', final_float), array('q', final_centavos)
+    soma_coluna_float, _ = cronometrar(lambda: sum(coluna_float))
+    soma_coluna_centavos, total_coluna = cronometrar(lambda: sum(coluna_centavos))
+    assert total_coluna == total_centavos
+
+    exato_float = sum(Decimal(repr(valor)).quantize(CENTAVO, ROUND_HALF_UP) for valor in final_float)
+    deriva = Decimal(repr(total_float)) - exato_float
+
+    print(f'{args.vendas} vendas, taxa {args.taxa:.0%}, desconto {args.desconto:.0%}')
+    print(f'{"Representação":<20} {"preços (s)":>11} {"soma (s)":>9} {"soma coluna (s)":>16}')
+    print(f'{"float":<20} {tempo_float:>11.3f} {soma_float:>9.3f} {soma_coluna_float:>16.3f}')
+    print(f'{"Decimal":<20} {tempo_decimal:>11.3f} {soma_decimal:>9.3f} {"-":>16}')
+    print(f'{"centavos inteiros":<20} {tempo_centavos:>11.3f} {soma_centavos:>9.3f} {soma_coluna_centavos:>16.3f}')
+    print(f'Total em centavos: R${modulo.Centavos(total_centavos)} (Decimal: R${total_decimal})')
+    print(f'Deriva do float acumulado: {deriva:+.10f} reais')
+    print(f'Preços divergentes entre Decimal e centavos: {divergentes}')
+
+
+if __name__ == '__main__':
+    main()
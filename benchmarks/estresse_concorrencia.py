@@ -0,0 +1,142 @@
+import argparse
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from comum import CAMINHO_PADRAO, carregar_modulo
+
+
+def montar_loja(modulo, clientes, jogos, saldo_inicial, diretorio=None):
+    loja = modulo.Loja(diretorio, concorrente=True, saida=modulo.SaidaNula())
+    loja.cadastrar_empresa('Editora', '00000000000100')
+    for i in range(jogos):
+        loja.cadastrar_produto('00000000000100', f'Jogo {i}', 10 * (1 + i % 5))
+    for i in range(clientes):
+        cpf = f'{i:011d}'
+        loja.cadastrar_cliente(f'Cliente {i}', cpf, 30)
+        loja.adicionar_saldo(cpf, saldo_inicial)
+    return loja
+
+
+def trabalhar(modulo, loja, cpfs, jogos, operacoes, semente, depositos):
+    aleatorio = random.Random(semente)
+    depositado = 0
+    extras = []
+    novos = []
+    for numero in range(operacoes):
+        sorteio = aleatorio.random()
+        cpf = aleatorio.choice(cpfs)
+        if sorteio < 0.55:
+            try:
+                loja.comprar_jogo(cpf, f'Jogo {aleatorio.randrange(jogos)}')
+            except modulo.ErroOperacaoNegada:
+                pass
+        elif sorteio < 0.70:
+            itens = [(aleatorio.choice(cpfs), f'Jogo {aleatorio.randrange(jogos)}') for _ in range(8)]
+            loja.comprar_jogos_em_lote(itens)
+        elif sorteio < 0.80:
+            valor = aleatorio.randint(1, 50)
+            loja.adicionar_saldo(cpf, valor)
+            depositado += valor * 100
+        elif sorteio < 0.85:
+            if extras and aleatorio.random() < 0.5:
+                loja.editar_produto('00000000000100', aleatorio.choice(extras), novo_preco=aleatorio.randint(5, 60))
+            else:
+                extras.append(f'Extra {semente}-{numero}')
+                loja.cadastrar_produto('00000000000100', extras[-1], aleatorio.randint(5, 60), 'PC', 'Ação')
+        elif sorteio < 0.90:
+            if novos and aleatorio.random() < 0.5:
+                loja.editar_cliente(aleatorio.choice(novos), f'Renomeado {numero}')
+            else:
+                novos.append(f'8{semente:03d}{numero:07d}')
+                loja.cadastrar_cliente(f'Novo {numero}', novos[-1], 25)
+        elif sorteio < 0.95:
+            loja.exibir_historico_cliente(cpf)
+        else:
+            loja.historico_cliente(cpf)
+            loja.relatorio_financeiro()
+    depositos.append(depositado)
+
+
+def disputar_mesmo_jogo(modulo, threads):
+    loja = montar_loja(modulo, 1, 1, 1000)
+    barreira = threading.Barrier(threads)
+
+    def comprar():
+        barreira.wait()
+        try:
+            loja.comprar_jogo('00000000000', 'Jogo 0')
+        except modulo.ErroOperacaoNegada:
+            pass
+
+    grupo = [threading.Thread(target=comprar) for _ in range(threads)]
+    for thread in grupo:
+        thread.start()
+    for thread in grupo:
+        thread.join()
+    assert len(loja.historico) == 1, f'{len(loja.historico)} vendas do mesmo jogo para o mesmo cliente'
+    assert loja._clientes['00000000000']._saldo == 100000 - 1300
+
+
+def verificar(loja, saldo_total_inicial, depositos):
+    saldo_final = sum(cliente._saldo for cliente in loja._clientes.values())
+    debitos = saldo_total_inicial + depositos - saldo_final
+    receita = loja._razao.receita
+    assert debitos == receita, f'débitos {debitos} != receita {receita}'
+    assert loja.relatorio_financeiro()['receita'] == receita
+
+    vendas = Counter((cpf, produto) for cpf, _, produto, _ in loja.historico)
+    duplicadas = [par for par, quantidade in vendas.items() if quantidade > 1]
+    assert not duplicadas, f'posse duplicada: {duplicadas[:5]}'
+
+    biblioteca = sum(len(cliente.listar_jogos()) for cliente in loja._clientes.values())
+    compradores = sum(len(cpfs) for cpfs in loja._compradores.values())
+    assert biblioteca == len(vendas) == compradores, (biblioteca, len(vendas), compradores)
+    return len(vendas), receita
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Estressa a Loja concorrente e verifica invariantes do razão.')
+    parser.add_argument('--caminho', default=CAMINHO_PADRAO)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--operacoes', type=int, default=5000, help='operações por thread')
+    parser.add_argument('--clientes', type=int, default=200)
+    parser.add_argument('--jogos', type=int, default=100)
+    parser.add_argument('--diario', action='store_true', help='grava o diário em um diretório temporário')
+    args = parser.parse_args()
+
+    modulo = carregar_modulo(args.caminho)
+    disputar_mesmo_jogo(modulo, args.threads)
+
+    diretorio = tempfile.mkdtemp(prefix='estresse_loja_') if args.diario else None
+    saldo_inicial = 200
+    loja = montar_loja(modulo, args.clientes, args.jogos, saldo_inicial, diretorio)
+    cpfs = list(loja._clientes)
+    depositos = []
+    grupo = [threading.Thread(target=trabalhar, args=(modulo, loja, cpfs, args.jogos, args.operacoes, semente, depositos))
+             for semente in range(args.threads)]
+    inicio = time.perf_counter()
+    for thread in grupo:
+        thread.start()
+    for thread in grupo:
+        thread.join()
+    duracao = time.perf_counter() - inicio
+    vendas, receita = verificar(loja, saldo_inicial * 100 * len(cpfs), sum(depositos))
+
+    if diretorio:
+        estado = loja._estado()
+        loja.fechar()
+        reaberta = modulo.Loja(diretorio, concorrente=True)
+        assert reaberta._razao.receita == receita
+        assert len(reaberta.historico) == vendas
+        assert reaberta._estado()['clientes'] == estado['clientes']
+
+    total = args.threads * args.operacoes
+    print(f'{total} operações em {duracao:.2f}s ({total / duracao:,.0f} ops/s) com {args.threads} threads')
+    print(f'{vendas} vendas, receita R${receita:.2f}: invariantes verificadas')
+
+
+if __name__ == '__main__':
+    main()
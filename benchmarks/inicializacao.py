@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from comum import RAIZ, carregar_modulo
+
+IMPORTAR = 'import time; inicio = time.perf_counter_ns(); import loja; print(time.perf_counter_ns() - inicio)'
+
+
+def medir_importacao(repeticoes):
+    importacao, processo = [], []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter_ns()
+        saida = subprocess.run([sys.executable, '-c', IMPORTAR], cwd=RAIZ, capture_output=True, text=True, check=True)
+        processo.append((time.perf_counter_ns() - inicio) / 1e6)
+        importacao.append(int(saida.stdout) / 1e6)
+    return {'importacao_ms': statistics.median(importacao), 'processo_ms': statistics.median(processo)}
+
+
+def preparar_dados(modulo, diretorio, empresas, produtos, clientes):
+    loja = modulo.Loja(diretorio, intervalo_snapshot=float('inf'), saida=modulo.SaidaNula())
+    for i in range(empresas):
+        loja.cadastrar_empresa(f'Editora {i}', f'{i:014d}')
+    for i in range(produtos):
+        loja.cadastrar_produto(f'{i % empresas:014d}', f'Jogo {i}', 5 + i % 300, 'PC', f'Categoria {i % 8}')
+    for i in range(clientes):
+        cpf = f'{i:011d}'
+        loja.cadastrar_cliente(f'Cliente {i}', cpf, 30)
+        loja.adicionar_saldo(cpf, 1000)
+    loja.comprar_jogos_em_lote([(f'{i:011d}', f'Jogo {i % produtos}') for i in range(clientes)])
+    loja.salvar_snapshot()
+    loja.fechar()
+
+
+def medir_partida(modulo, diretorio, imediata, operacao, argumentos):
+    comando = [sys.executable, '-m', 'loja', '--servidor', '--porta', '0', '--dados', diretorio]
+    if imediata:
+        comando.append('--carga-imediata')
+    inicio = time.perf_counter_ns()
+    processo = subprocess.Popen(comando, cwd=RAIZ, stdout=subprocess.PIPE, text=True)
+    try:
+        linha = processo.stdout.readline()
+        escutando = time.perf_counter_ns()
+        host, porta = linha.rsplit(' ', 1)[1].strip().rsplit(':', 1)
+        cliente = modulo.ClienteLoja(host, int(porta))
+        resposta = cliente.chamar(operacao, *argumentos)
+        primeira = time.perf_counter_ns()
+        cliente.fechar()
+    finally:
+        processo.terminate()
+        processo.wait()
+    if not resposta['ok']:
+        raise RuntimeError(resposta)
+    return {'escutando_ms': (escutando - inicio) / 1e6, 'primeira_resposta_ms': (primeira - inicio) / 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mede o tempo de importação e da partida a frio até o primeiro pedido atendido.')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--empresas', type=int, default=50)
+    parser.add_argument('--produtos', type=int, default=20000)
+    parser.add_argument('--clientes', type=int, default=20000)
+    parser.add_argument('--operacao', default='listar_cliente')
+    parser.add_argument('--argumentos', default='[0, 1]', help='lista JSON de argumentos da operação')
+    parser.add_argument('--saida', help='arquivo JSON com os resultados')
+    args = parser.parse_args()
+
+    modulo = carregar_modulo()
+    argumentos = json.loads(args.argumentos)
+    resultado = {'parametros': vars(args), 'importacao': medir_importacao(args.repeticoes), 'partida': {}}
+    print(f'import loja: {resultado["importacao"]["importacao_ms"]:.1f} ms '
+          f'(processo completo {resultado["importacao"]["processo_ms"]:.1f} ms)')
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        preparar_dados(modulo, diretorio, args.empresas, args.produtos, args.clientes)
+        tamanho = os.path.getsize(os.path.join(diretorio, 'snapshot.json'))
+        print(f'Snapshot com {args.produtos} produtos e {args.clientes} clientes: {tamanho / 2 ** 20:.1f} MiB')
+        print(f'{"Carga":<12} {"escutando ms":>13} {"1ª resposta ms":>15}')
+        for nome, imediata in (('imediata', True), ('sob demanda', False)):
+            medidas = [medir_partida(modulo, diretorio, imediata, args.operacao, argumentos) for _ in range(args.repeticoes)]
+            mediana = {chave: statistics.median(medida[chave] for medida in medidas) for chave in medidas[0]}
+            resultado['partida'][nome] = mediana
+            print(f'{nome:<12} {mediana["escutando_ms"]:>13.1f} {mediana["primeira_resposta_ms"]:>15.1f}')
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import gc
+import tracemalloc
+
+from comum import CAMINHO_PADRAO, carregar_modulo
+
+PLATAFORMAS = ['PC', 'PlayStation', 'Xbox', 'Switch']
+CATEGORIAS = ['Ação', 'RPG', 'Estratégia', 'Esporte', 'Corrida', 'Puzzle']
+
+
+def copia(texto):
+    return (texto + ' ')[:-1]
+
+
+def medir(criar, quantidade):
+    gc.collect()
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    objetos = criar(quantidade)
+    fim = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objetos
+    return (fim - inicio) / quantidade
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mede bytes por entidade das classes de domínio da loja.')
+    parser.add_argument('caminho', nargs='?', default=CAMINHO_PADRAO)
+    parser.add_argument('-n', '--quantidade', type=int, default=100000)
+    args = parser.parse_args()
+
+    modulo = carregar_modulo(args.caminho)
+    referencia_empresa = hasattr(modulo.Jogo, 'empresa')
+    tabela = {'tabela': modulo.TabelaPrecos()} if hasattr(modulo, 'TabelaPrecos') else {}
+
+    def criar_empresas(n):
+        return [modulo.Empresa(f'Empresa {i}', f'{i:014d}') for i in range(n)]
+
+    def criar_clientes(n):
+        return [modulo.Cliente(f'Cliente {i}', f'{i:011d}', 18 + i % 60) for i in range(n)]
+
+    empresas = [modulo.Empresa(f'Editora {i}', f'{i:014d}') for i in range(100)]
+
+    def criar_jogos(n):
+        jogos = []
+        for i in range(n):
+            empresa = empresas[i % len(empresas)]
+            chave = empresa if referencia_empresa else copia(empresa.nome)
+            jogos.append(modulo.Jogo(f'Jogo {i}', 1000 + i % 9000, chave,
+                                     copia(PLATAFORMAS[i % len(PLATAFORMAS)]), copia(CATEGORIAS[i % len(CATEGORIAS)]), **tabela))
+        return jogos
+
+    print(f'{"Entidade":<10} {"bytes/entidade":>15}')
+    for nome, criar in (('Empresa', criar_empresas), ('Cliente', criar_clientes), ('Jogo', criar_jogos)):
+        print(f'{nome:<10} {medir(criar, args.quantidade):>15.1f}')
+
+
+if __name__ == '__main__':
+    main()
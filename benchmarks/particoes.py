@@ -0,0 +1,84 @@
+import argparse
+import json
+import os
+import threading
+import time
+
+from comum import carregar_modulo
+
+
+def montar(modulo, particoes, clientes, jogos):
+    if particoes:
+        loja = modulo.LojaParticionada(particoes, saida=modulo.SaidaNula())
+    else:
+        loja = modulo.Loja(concorrente=True, saida=modulo.SaidaNula())
+    loja.cadastrar_empresa('Editora', '00000000000100')
+    for i in range(jogos):
+        loja.cadastrar_produto('00000000000100', f'Jogo {i}', 1 + i % 5)
+    for i in range(clientes):
+        cpf = f'{i:011d}'
+        loja.cadastrar_cliente(f'Cliente {i}', cpf, 30)
+        loja.adicionar_saldo(cpf, 10 * jogos)
+    return loja
+
+
+def medir(loja, clientes, jogos, threads, tamanho_lote):
+    compras = [(f'{cliente:011d}', f'Jogo {jogo}') for jogo in range(jogos) for cliente in range(clientes)]
+    if tamanho_lote > 1:
+        tarefas = [compras[i:i + tamanho_lote] for i in range(0, len(compras), tamanho_lote)]
+        executar = loja.comprar_jogos_em_lote
+    else:
+        tarefas = compras
+        executar = lambda compra: loja.comprar_jogo(*compra)
+
+    def trabalhar(parte):
+        for tarefa in parte:
+            executar(tarefa)
+
+    trabalhadores = [threading.Thread(target=trabalhar, args=(tarefas[i::threads],)) for i in range(threads)]
+    inicio = time.perf_counter()
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+    duracao = time.perf_counter() - inicio
+    quantidade = loja.relatorio_financeiro()['quantidade']
+    if quantidade != len(compras):
+        raise AssertionError(f'{quantidade} vendas registradas, esperadas {len(compras)}')
+    return {'compras': quantidade, 'segundos': duracao, 'compras_por_s': quantidade / duracao}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mede a vazão de compras da loja particionada por CPF.')
+    parser.add_argument('--particoes', default=f'0,1,2,{os.cpu_count() or 1}',
+                        help='quantidades de partições separadas por vírgula (0 = Loja em um processo)')
+    parser.add_argument('--clientes', type=int, default=5000)
+    parser.add_argument('--jogos', type=int, default=40)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--lote', type=int, default=256, help='compras por chamada (1 = comprar_jogo)')
+    parser.add_argument('--saida', help='arquivo JSON com os resultados')
+    args = parser.parse_args()
+
+    modulo = carregar_modulo()
+    resultado = {'parametros': vars(args), 'nucleos': os.cpu_count(), 'medidas': {}}
+    print(f'{args.clientes * args.jogos} compras, {args.threads} threads, lote {args.lote}, {os.cpu_count()} núcleos')
+    print(f'{"Partições":<12} {"compras/s":>12} {"aceleração":>11}')
+    referencia = None
+    for particoes in sorted({int(valor) for valor in args.particoes.split(',')}):
+        loja = montar(modulo, particoes, args.clientes, args.jogos)
+        try:
+            medida = medir(loja, args.clientes, args.jogos, args.threads, args.lote)
+        finally:
+            loja.fechar()
+        referencia = referencia or medida['compras_por_s']
+        resultado['medidas'][particoes] = medida
+        nome = str(particoes) if particoes else 'sem (Loja)'
+        print(f'{nome:<12} {medida["compras_por_s"]:>12,.0f} {medida["compras_por_s"] / referencia:>10.2f}x')
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import random
+import time
+
+from comum import CAMINHO_PADRAO, carregar_modulo
+
+DIA = 86400
+
+
+def cronometrar(funcao, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = funcao()
+    return (time.perf_counter() - inicio) / repeticoes, resultado
+
+
+def preencher(modulo, vendas, dias, produtos, semente):
+    aleatorio = random.Random(semente)
+    registro = modulo.RegistroVendas()
+    inicio = time.time() - dias * DIA
+    passo = dias * DIA / vendas
+    for indice in range(vendas):
+        receita = aleatorio.randint(500, 30000)
+        registro.registrar(receita, receita * 3 // 10, inicio + indice * passo + aleatorio.random() * passo,
+                           cliente=f'{aleatorio.randrange(vendas // 10 + 1):011d}', nome_cliente='Cliente',
+                           produto=f'Jogo {aleatorio.randrange(produtos)}', empresa='Editora', categoria='Ação',
+                           plataforma='PC', promocao=None)
+    return registro, inicio
+
+
+def varrer_linhas(registro, inicio, fim):
+    receita = lucro = quantidade = 0
+    for indice in range(len(registro)):
+        if inicio <= registro.instante(indice) < fim:
+            _, _, _, valor = registro.linha(indice)
+            receita += valor
+            lucro += registro._lucro[indice]
+            quantidade += 1
+    return {'receita': receita, 'lucro': lucro, 'quantidade': quantidade}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara consultas por período com baldes agregados e com varredura de vendas.')
+    parser.add_argument('--caminho', default=CAMINHO_PADRAO)
+    parser.add_argument('-n', '--vendas', type=int, default=1000000)
+    parser.add_argument('--dias', type=int, default=31)
+    parser.add_argument('--produtos', type=int, default=5000)
+    parser.add_argument('--repeticoes', type=int, default=200)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    modulo = carregar_modulo(args.caminho)
+    inicio = time.perf_counter()
+    registro, primeiro = preencher(modulo, args.vendas, args.dias, args.produtos, args.semente)
+    print(f'{args.vendas} vendas em {args.dias} dias registradas em {time.perf_counter() - inicio:.2f}s '
+          f'({", ".join(f"{len(serie)} baldes de {nome}" for nome, serie in registro._series.items())})')
+
+    aleatorio = random.Random(args.semente)
+    janelas = [(primeiro + aleatorio.uniform(0, DIA), primeiro + args.dias * DIA - aleatorio.uniform(0, DIA))
+               for _ in range(args.repeticoes)]
+    janela = iter(janelas)
+    inicio_mes, fim_mes = janelas[-1]
+
+    baldes, _ = cronometrar(lambda: registro.totais_entre(*next(janela)), args.repeticoes)
+    fatias, _ = cronometrar(lambda: registro._somar_periodo(inicio_mes, fim_mes, len(registro._series)), 5)
+    varredura, obtido = cronometrar(lambda: varrer_linhas(registro, inicio_mes, fim_mes), 1)
+    esperado = registro.totais_entre(inicio_mes, fim_mes)
+    assert {chave: int(valor) for chave, valor in esperado.items()} == obtido
+    painel, _ = cronometrar(lambda: registro.serie('hora', inicio_mes, fim_mes), args.repeticoes)
+    semana = (fim_mes - 7 * DIA, fim_mes)
+    ranking, _ = cronometrar(lambda: registro.mais_vendidos(100, 'produto', 'receita', *semana), 5)
+
+    print(f'{"Consulta do mês":<34} {"ms":>10}')
+    print(f'{"totais por baldes":<34} {baldes * 1e3:>10.3f}')
+    print(f'{"totais por fatia de linhas":<34} {fatias * 1e3:>10.3f}')
+    print(f'{"totais por varredura completa":<34} {varredura * 1e3:>10.3f}')
+    print(f'{"série por hora (painel)":<34} {painel * 1e3:>10.3f}')
+    print(f'{"top 100 por receita na semana":<34} {ranking * 1e3:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
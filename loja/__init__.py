@@ -0,0 +1,34 @@
+from .busca import IndiceBusca, normalizar
+from .catalogo import CatalogoMapeado, ProdutoMapeado, escrever_catalogo
+from .concorrencia import Razao, TravaLeituraEscrita, TravaNula
+from .dinheiro import (MARGEM_LUCRO_PB, PONTOS_BASE, Centavos, aplicar_pontos_base, dividir_arredondando,
+                       em_pontos_base, formatar_centavos, para_centavos)
+from .dominio import Base, Cliente, Empresa, Jogo, TabelaPrecos
+from .erros import ErroDuplicado, ErroLoja, ErroNaoEncontrado, ErroOperacaoNegada, ErroSaldoInsuficiente, ErroValidacao
+from .interfaces import LojaInterface, ProdutoInterface
+from .loja import Loja, paginar
+from .metricas import CronometroEtapa, EstatisticaOperacao, Metricas, MetricasNulas
+from .persistencia import Diario, decodificar_registro, ler_registros
+from .resultados import Resultado, SaidaBuffer, SaidaConsole, SaidaEventos, SaidaNula
+from .vendas import RegistroVendas
+
+__all__ = [
+    'Base', 'CatalogoMapeado', 'Centavos', 'Cliente', 'ClienteLoja', 'CronometroEtapa', 'Diario', 'Empresa',
+    'ErroDuplicado', 'ErroLoja', 'ErroNaoEncontrado', 'ErroOperacaoNegada', 'ErroSaldoInsuficiente', 'ErroValidacao',
+    'EstatisticaOperacao', 'IndiceBusca', 'Jogo', 'Loja', 'LojaInterface', 'LojaParticionada', 'MARGEM_LUCRO_PB',
+    'Metricas', 'MetricasNulas', 'PONTOS_BASE', 'ProdutoInterface', 'Particao', 'ProdutoMapeado', 'Razao',
+    'RegistroVendas', 'Resultado', 'SaidaBuffer', 'SaidaConsole', 'SaidaEventos', 'SaidaNula', 'ServidorLoja',
+    'TabelaPrecos', 'TravaLeituraEscrita', 'TravaNula', 'aplicar_pontos_base', 'decodificar_registro',
+    'dividir_arredondando', 'em_pontos_base', 'escrever_catalogo', 'formatar_centavos', 'ler_registros', 'normalizar',
+    'paginar', 'para_centavos', 'particao_do_cpf',
+]
+
+
+def __getattr__(nome):
+    if nome in ('ServidorLoja', 'ClienteLoja'):
+        from . import servidor
+        return getattr(servidor, nome)
+    if nome in ('LojaParticionada', 'Particao', 'particao_do_cpf'):
+        from . import particoes
+        return getattr(particoes, nome)
+    raise AttributeError(f'module {__name__!r} has no attribute {nome!r}')
@@ -0,0 +1,54 @@
+import argparse
+
+from .loja import Loja
+from .resultados import SaidaNula
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='loja', description='Loja de jogos')
+    parser.add_argument('--dados', default='dados_loja')
+    parser.add_argument('--servidor', action='store_true', help='atende pedidos JSON por TCP em vez do menu')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--metricas', action='store_true', help='registra contagens e latências por operação')
+    parser.add_argument('--carga-imediata', action='store_true', help='no modo servidor, carrega os dados antes de abrir a porta')
+    parser.add_argument('--particoes', type=int, default=0,
+                        help='no modo servidor, distribui os clientes por CPF entre N processos')
+    args = parser.parse_args(argv)
+    if args.particoes and not args.servidor:
+        parser.error('--particoes exige --servidor')
+    if args.particoes and args.metricas:
+        parser.error('--metricas não é suportado com --particoes')
+
+    if args.particoes:
+        from .particoes import LojaParticionada
+
+        loja = LojaParticionada(args.particoes, args.dados, saida=SaidaNula())
+    else:
+        loja = Loja(args.dados, concorrente=args.servidor, saida=SaidaNula() if args.servidor else None,
+                    carregar_sob_demanda=args.servidor and not args.carga_imediata)
+    if args.metricas:
+        loja.ativar_metricas()
+    if args.servidor:
+        import asyncio
+        from .servidor import ServidorLoja
+
+        servidor = ServidorLoja(loja, args.host, args.porta)
+
+        async def servir():
+            await servidor.iniciar()
+            print(f'Atendendo em {args.host}:{servidor.porta}', flush=True)
+            await servidor.servir_para_sempre()
+
+        try:
+            asyncio.run(servir())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            loja.fechar()
+    else:
+        loja.executar()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+import bisect
+import re
+import unicodedata
+
+
+def normalizar(texto):
+    decomposto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in decomposto if not unicodedata.combining(c)).casefold()
+
+class IndiceBusca:
+    FACETAS = ('plataforma', 'categoria', 'promocao')
+    LIMITE_INSERCAO_DIRETA = 1000
+
+    def __init__(self):
+        self._documentos = {}
+        self._postagens = {}
+        self._vocabulario = []
+        self._novos_termos = set()
+        self._facetas = {faceta: {} for faceta in self.FACETAS}
+
+    def __len__(self):
+        return len(self._documentos)
+
+    @staticmethod
+    def tokenizar(texto):
+        return re.findall(r'\w+', normalizar(texto))
+
+    def adicionar(self, produto):
+        self.remover(produto.nome)
+        normalizado = normalizar(produto.nome)
+        termos = tuple(set(re.findall(r'\w+', normalizado)))
+        facetas = (produto._plataforma, produto._categoria, produto._tipo_promocao)
+        self._documentos[produto.nome] = (normalizado, termos, facetas)
+        for termo in termos:
+            postagem = self._postagens.get(termo)
+            if postagem is None:
+                postagem = self._postagens[termo] = set()
+                self._novos_termos.add(termo)
+            postagem.add(produto.nome)
+        for faceta, valor in zip(self.FACETAS, facetas):
+            if valor is not None:
+                self._facetas[faceta].setdefault(valor, set()).add(produto.nome)
+
+    def remover(self, nome_produto):
+        documento = self._documentos.pop(nome_produto, None)
+        if documento is None:
+            return
+        normalizado, termos, facetas = documento
+        for termo in termos:
+            postagem = self._postagens[termo]
+            postagem.discard(nome_produto)
+            if not postagem:
+                del self._postagens[termo]
+        for faceta, valor in zip(self.FACETAS, facetas):
+            if valor is not None:
+                nomes = self._facetas[faceta][valor]
+                nomes.discard(nome_produto)
+                if not nomes:
+                    del self._facetas[faceta][valor]
+
+    def atualizar_faceta(self, nome_produto, faceta, valor):
+        normalizado, termos, facetas = self._documentos[nome_produto]
+        posicao = self.FACETAS.index(faceta)
+        anterior = facetas[posicao]
+        if anterior == valor:
+            return
+        if anterior is not None:
+            nomes = self._facetas[faceta][anterior]
+            nomes.discard(nome_produto)
+            if not nomes:
+                del self._facetas[faceta][anterior]
+        if valor is not None:
+            self._facetas[faceta].setdefault(valor, set()).add(nome_produto)
+        self._documentos[nome_produto] = (normalizado, termos, facetas[:posicao] + (valor,) + facetas[posicao + 1:])
+
+    def nomes_da_faceta(self, faceta, valor):
+        return self._facetas[faceta].get(valor, ())
+
+    def _termos_ordenados(self):
+        if not self._novos_termos:
+            return self._vocabulario
+        if len(self._novos_termos) <= self.LIMITE_INSERCAO_DIRETA:
+            for termo in self._novos_termos:
+                posicao = bisect.bisect_left(self._vocabulario, termo)
+                if posicao == len(self._vocabulario) or self._vocabulario[posicao] != termo:
+                    self._vocabulario.insert(posicao, termo)
+        else:
+            termos = set(self._vocabulario) | self._novos_termos
+            self._vocabulario = sorted(termo for termo in termos if termo in self._postagens)
+        self._novos_termos = set()
+        return self._vocabulario
+
+    def _termos_com_prefixo(self, prefixo):
+        vocabulario = self._termos_ordenados()
+        inicio = bisect.bisect_left(vocabulario, prefixo)
+        fim = bisect.bisect_left(vocabulario, prefixo + '\U0010ffff')
+        return vocabulario[inicio:fim]
+
+    def _estimar(self, termos, teto=None):
+        total = 0
+        for termo in termos:
+            total += len(self._postagens.get(termo, ()))
+            if teto is not None and total >= teto:
+                break
+        return total
+
+    def _unir(self, termos):
+        vistos = set()
+        for termo in termos:
+            for nome in self._postagens.get(termo, ()):
+                if nome not in vistos:
+                    vistos.add(nome)
+                    yield nome
+
+    def buscar(self, texto=None, trecho=None, plataforma=None, categoria=None, promocao=None, limite=50):
+        conjuntos = []
+        for faceta, valor in zip(self.FACETAS, (plataforma, categoria, promocao)):
+            if valor is not None:
+                conjuntos.append(self._facetas[faceta].get(valor, set()))
+        prefixos = self.tokenizar(texto) if texto else []
+        trecho_normalizado = normalizar(trecho) if trecho else None
+
+        conjuntos.sort(key=len)
+        teto = len(conjuntos[0]) if conjuntos else None
+        seletivo = None
+        for indice, prefixo in enumerate(prefixos):
+            termos = self._termos_com_prefixo(prefixo)
+            estimativa = self._estimar(termos, teto)
+            if teto is None or estimativa < teto:
+                teto, seletivo, candidatos = estimativa, indice, termos
+
+        if seletivo is not None:
+            base = self._unir(candidatos)
+            prefixos = prefixos[:seletivo] + prefixos[seletivo + 1:]
+        elif conjuntos:
+            base = conjuntos.pop(0)
+        elif trecho_normalizado:
+            termos = self.tokenizar(trecho)
+            maior = max(termos, key=len) if termos else ''
+            base = self._unir(termo for termo in self._termos_ordenados() if maior in termo)
+        else:
+            base = self._documentos.keys()
+
+        resultado = []
+        for nome in base:
+            if conjuntos and not all(nome in conjunto for conjunto in conjuntos):
+                continue
+            normalizado, termos, _ = self._documentos[nome]
+            if prefixos and not all(any(termo.startswith(prefixo) for termo in termos) for prefixo in prefixos):
+                continue
+            if trecho_normalizado and trecho_normalizado not in normalizado:
+                continue
+            resultado.append(nome)
+            if limite is not None and len(resultado) >= limite:
+                break
+        resultado.sort()
+        return resultado
+
+    def contar_facetas(self, nomes):
+        contagem = {faceta: {} for faceta in self.FACETAS}
+        for nome in nomes:
+            for faceta, valor in zip(self.FACETAS, self._documentos[nome][2]):
+                if valor is not None:
+                    contagem[faceta][valor] = contagem[faceta].get(valor, 0) + 1
+        return contagem
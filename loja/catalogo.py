@@ -0,0 +1,269 @@
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import zlib
+
+from .dinheiro import Centavos, em_pontos_base, formatar_centavos
+from .erros import ErroLoja
+
+MAGICO = b'LOJACAT1'
+CABECALHO = struct.Struct('<8sIIIIIQQQQQQ')
+REGISTRO = struct.Struct('<IIIIIIIiqqq')
+EMPRESA = struct.Struct('<IIII')
+PROMOCAO = struct.Struct('<III')
+BALDE = struct.Struct('<II')
+SEM_TEXTO = 0xFFFFFFFF
+_ler_balde = BALDE.unpack_from
+_ler_texto = struct.Struct('<II').unpack_from
+_ler_preco = struct.Struct('<q').unpack_from
+_DESLOCAMENTO_PRECO_FINAL = REGISTRO.size - 8
+
+def _hash(nome_bytes):
+    return zlib.crc32(nome_bytes) or 1
+
+class _TabelaTextos:
+    def __init__(self):
+        self._posicoes = {}
+        self._partes = []
+        self._tamanho = 0
+
+    def adicionar(self, texto):
+        if texto is None:
+            return SEM_TEXTO, 0
+        posicao = self._posicoes.get(texto)
+        dados = texto.encode('utf-8')
+        if posicao is None:
+            posicao = self._posicoes[texto] = self._tamanho
+            self._partes.append(dados)
+            self._tamanho += len(dados)
+        return posicao, len(dados)
+
+    def bytes(self):
+        return b''.join(self._partes)
+
+def escrever_catalogo(caminho, empresas, promocoes, taxa_pb, versao=0):
+    textos = _TabelaTextos()
+    indices_empresa = {}
+    blocos_empresas = []
+    for empresa in empresas:
+        indices_empresa[empresa.chave] = len(blocos_empresas)
+        blocos_empresas.append(EMPRESA.pack(*textos.adicionar(empresa.nome), *textos.adicionar(empresa.chave)))
+
+    indices_promocao = {}
+    blocos_promocoes = []
+    for tipo_promocao, desconto in promocoes.items():
+        indices_promocao[tipo_promocao] = len(blocos_promocoes)
+        blocos_promocoes.append(PROMOCAO.pack(*textos.adicionar(tipo_promocao), em_pontos_base(desconto)))
+
+    blocos_registros = []
+    hashes = []
+    for empresa in empresas:
+        for produto in empresa.produtos:
+            nome = textos.adicionar(produto.nome)
+            hashes.append(_hash(produto.nome.encode('utf-8')))
+            blocos_registros.append(REGISTRO.pack(
+                *nome, indices_empresa[empresa.chave], *textos.adicionar(produto._plataforma),
+                *textos.adicionar(produto._categoria), indices_promocao.get(produto._tipo_promocao, -1),
+                produto._preco_original, produto.preco_com_taxa, produto.aplicar_promocao()))
+
+    baldes = 1
+    while baldes < 2 * len(hashes):
+        baldes *= 2
+    mascara = baldes - 1
+    indice = [(0, 0)] * baldes
+    for posicao, valor in enumerate(hashes):
+        balde = valor & mascara
+        while indice[balde][0]:
+            balde = (balde + 1) & mascara
+        indice[balde] = (valor, posicao)
+
+    inicio_empresas = CABECALHO.size
+    inicio_promocoes = inicio_empresas + EMPRESA.size * len(blocos_empresas)
+    inicio_registros = inicio_promocoes + PROMOCAO.size * len(blocos_promocoes)
+    inicio_indice = inicio_registros + REGISTRO.size * len(blocos_registros)
+    inicio_textos = inicio_indice + BALDE.size * baldes
+    cabecalho = CABECALHO.pack(MAGICO, len(blocos_registros), len(blocos_empresas), len(blocos_promocoes), baldes,
+                               taxa_pb, versao, inicio_empresas, inicio_promocoes, inicio_registros,
+                               inicio_indice, inicio_textos)
+
+    descritor, temporario = tempfile.mkstemp(prefix=f'{os.path.basename(caminho)}.', suffix='.tmp',
+                                             dir=os.path.dirname(caminho) or '.')
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            arquivo.write(cabecalho)
+            arquivo.write(b''.join(blocos_empresas))
+            arquivo.write(b''.join(blocos_promocoes))
+            arquivo.write(b''.join(blocos_registros))
+            arquivo.write(b''.join(BALDE.pack(*balde) for balde in indice))
+            arquivo.write(textos.bytes())
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+    return len(blocos_registros)
+
+class _Versao:
+    __slots__ = ('mapa', 'identidade', 'produtos', 'empresas', 'promocoes', 'baldes', 'taxa_pb', 'versao',
+                 'inicio_empresas', 'inicio_promocoes', 'inicio_registros', 'inicio_indice', 'inicio_textos')
+
+    def __init__(self, caminho):
+        with open(caminho, 'rb') as arquivo:
+            estado = os.fstat(arquivo.fileno())
+            if estado.st_size < CABECALHO.size:
+                raise ErroLoja(f'Catálogo inválido: {caminho}')
+            self.mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identidade = (estado.st_dev, estado.st_ino)
+        (magico, self.produtos, self.empresas, self.promocoes, self.baldes, self.taxa_pb, self.versao,
+         self.inicio_empresas, self.inicio_promocoes, self.inicio_registros, self.inicio_indice,
+         self.inicio_textos) = CABECALHO.unpack_from(self.mapa, 0)
+        if magico != MAGICO:
+            self.mapa.close()
+            raise ErroLoja(f'Catálogo inválido: {caminho}')
+
+    def texto(self, posicao, tamanho):
+        if posicao == SEM_TEXTO:
+            return None
+        inicio = self.inicio_textos + posicao
+        return str(self.mapa[inicio:inicio + tamanho], 'utf-8')
+
+    def localizar(self, nome):
+        dados = nome.encode('utf-8')
+        valor = _hash(dados)
+        mascara = self.baldes - 1
+        balde = valor & mascara
+        mapa = self.mapa
+        while True:
+            guardado, posicao = _ler_balde(mapa, self.inicio_indice + 8 * balde)
+            if not guardado:
+                return -1
+            if guardado == valor:
+                inicio, tamanho = _ler_texto(mapa, self.inicio_registros + posicao * REGISTRO.size)
+                inicio += self.inicio_textos
+                if mapa[inicio:inicio + tamanho] == dados:
+                    return posicao
+            balde = (balde + 1) & mascara
+
+    def preco_final(self, posicao):
+        return _ler_preco(self.mapa, self.inicio_registros + posicao * REGISTRO.size + _DESLOCAMENTO_PRECO_FINAL)[0]
+
+    def registro(self, posicao):
+        return REGISTRO.unpack_from(self.mapa, self.inicio_registros + posicao * REGISTRO.size)
+
+class ProdutoMapeado:
+    __slots__ = ('_versao', '_registro')
+
+    def __init__(self, versao, registro):
+        self._versao = versao
+        self._registro = registro
+
+    @property
+    def nome(self):
+        return self._versao.texto(*self._registro[0:2])
+
+    @property
+    def empresa(self):
+        posicao = self._versao.inicio_empresas + self._registro[2] * EMPRESA.size
+        return self._versao.texto(*EMPRESA.unpack_from(self._versao.mapa, posicao)[0:2])
+
+    @property
+    def chave(self):
+        return self.empresa
+
+    @property
+    def plataforma(self):
+        return self._versao.texto(*self._registro[3:5])
+
+    @property
+    def categoria(self):
+        return self._versao.texto(*self._registro[5:7])
+
+    @property
+    def tipo_promocao(self):
+        indice = self._registro[7]
+        if indice < 0:
+            return None
+        posicao = self._versao.inicio_promocoes + indice * PROMOCAO.size
+        return self._versao.texto(*PROMOCAO.unpack_from(self._versao.mapa, posicao)[0:2])
+
+    @property
+    def preco_original(self):
+        return Centavos(self._registro[8])
+
+    @property
+    def preco_com_taxa(self):
+        return Centavos(self._registro[9])
+
+    def aplicar_promocao(self):
+        return self._registro[10]
+
+    def __str__(self):
+        return (f'Nome: {self.nome}, Empresa: {self.empresa}, '
+                f'Plataforma: {self.plataforma or "N/A"}, Categoria: {self.categoria or "N/A"}, '
+                f'Preço Original: R${formatar_centavos(self._registro[8])}, '
+                f'Preço com Taxa: R${formatar_centavos(self._registro[9])}, '
+                f'Preço com Taxa e Desconto: R${formatar_centavos(self._registro[10])}')
+
+class CatalogoMapeado:
+    def __init__(self, caminho):
+        self._caminho = caminho
+        self._trava = threading.Lock()
+        self._atual = _Versao(caminho)
+
+    @property
+    def versao(self):
+        return self._atual.versao
+
+    def __len__(self):
+        return self._atual.produtos
+
+    def __contains__(self, nome_produto):
+        return self._atual.localizar(nome_produto) >= 0
+
+    def recarregar(self):
+        try:
+            estado = os.stat(self._caminho)
+        except FileNotFoundError:
+            return False
+        if (estado.st_dev, estado.st_ino) == self._atual.identidade:
+            return False
+        with self._trava:
+            if (estado.st_dev, estado.st_ino) == self._atual.identidade:
+                return False
+            self._atual = _Versao(self._caminho)
+        return True
+
+    def buscar_produto(self, nome_produto):
+        atual = self._atual
+        posicao = atual.localizar(nome_produto)
+        if posicao < 0:
+            return None
+        return ProdutoMapeado(atual, atual.registro(posicao))
+
+    def preco(self, nome_produto):
+        atual = self._atual
+        posicao = atual.localizar(nome_produto)
+        if posicao < 0:
+            return None
+        return Centavos(atual.preco_final(posicao))
+
+    def empresa_do_produto(self, nome_produto):
+        produto = self.buscar_produto(nome_produto)
+        return None if produto is None else produto.empresa
+
+    def iterar_produtos(self, offset=0, limite=None):
+        atual = self._atual
+        fim = atual.produtos if limite is None else min(atual.produtos, offset + limite)
+        for posicao in range(offset, fim):
+            yield ProdutoMapeado(atual, atual.registro(posicao))
+
+    def listar_produto(self, offset=0, limite=None):
+        return [str(produto) for produto in self.iterar_produtos(offset, limite)]
+
+    def fechar(self):
+        atual, self._atual = self._atual, None
+        if atual is not None:
+            atual.mapa.close()
@@ -0,0 +1,130 @@
+import itertools
+import threading
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+from .dinheiro import Centavos
+
+
+class TravaLeituraEscrita:
+    def __init__(self):
+        self._condicao = threading.Condition(threading.Lock())
+        self._leitores = {}
+        self._escritor = None
+        self._profundidade = 0
+        self._escritores_esperando = 0
+
+    @contextmanager
+    def leitura(self):
+        eu = threading.get_ident()
+        with self._condicao:
+            if self._escritor == eu:
+                self._profundidade += 1
+            elif eu in self._leitores:
+                self._leitores[eu] += 1
+            else:
+                while self._escritor is not None or self._escritores_esperando:
+                    self._condicao.wait()
+                self._leitores[eu] = 1
+        try:
+            yield
+        finally:
+            with self._condicao:
+                if self._escritor == eu:
+                    self._profundidade -= 1
+                else:
+                    self._leitores[eu] -= 1
+                    if not self._leitores[eu]:
+                        del self._leitores[eu]
+                        if not self._leitores:
+                            self._condicao.notify_all()
+
+    @contextmanager
+    def escrita(self):
+        eu = threading.get_ident()
+        with self._condicao:
+            if self._escritor == eu:
+                self._profundidade += 1
+            else:
+                self._escritores_esperando += 1
+                while self._escritor is not None or self._leitores:
+                    self._condicao.wait()
+                self._escritores_esperando -= 1
+                self._escritor = eu
+                self._profundidade = 1
+        try:
+            yield
+        finally:
+            with self._condicao:
+                self._profundidade -= 1
+                if not self._profundidade:
+                    self._escritor = None
+                    self._condicao.notify_all()
+
+class TravaNula:
+    _contexto = nullcontext()
+
+    def leitura(self):
+        return self._contexto
+
+    def escrita(self):
+        return self._contexto
+
+class Razao:
+    def __init__(self, faixas=1):
+        self._faixas = [[threading.Lock(), 0, 0] for _ in range(faixas)]
+        self._proxima = itertools.count()
+        self._local = threading.local()
+
+    def _faixa(self):
+        faixa = getattr(self._local, 'faixa', None)
+        if faixa is None:
+            faixa = self._local.faixa = self._faixas[next(self._proxima) % len(self._faixas)]
+        return faixa
+
+    def adicionar(self, receita, lucro):
+        faixa = self._faixa()
+        with faixa[0]:
+            faixa[1] += receita
+            faixa[2] += lucro
+
+    def definir(self, receita, lucro):
+        for faixa in self._faixas:
+            with faixa[0]:
+                faixa[1] = faixa[2] = 0
+        self._faixas[0][1] = receita
+        self._faixas[0][2] = lucro
+
+    @property
+    def receita(self):
+        return Centavos(sum(faixa[1] for faixa in self._faixas))
+
+    @property
+    def lucro(self):
+        return Centavos(sum(faixa[2] for faixa in self._faixas))
+
+def apos_carga(metodo):
+    @wraps(metodo)
+    def envolvido(self, *args, **kwargs):
+        if self._carga_pendente:
+            self.carregar()
+        return metodo(self, *args, **kwargs)
+    return envolvido
+
+def leitura(metodo):
+    @wraps(metodo)
+    def envolvido(self, *args, **kwargs):
+        if self._carga_pendente:
+            self.carregar()
+        with self._trava.leitura():
+            return metodo(self, *args, **kwargs)
+    return envolvido
+
+def escrita(metodo):
+    @wraps(metodo)
+    def envolvido(self, *args, **kwargs):
+        if self._carga_pendente:
+            self.carregar()
+        with self._trava.escrita():
+            return metodo(self, *args, **kwargs)
+    return envolvido
@@ -0,0 +1,54 @@
+import math
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from .erros import ErroValidacao
+
+
+PONTOS_BASE = 10000
+MARGEM_LUCRO_PB = 3000
+
+class Centavos(int):
+    __slots__ = ()
+
+    @property
+    def reais(self):
+        return Decimal(int(self)).scaleb(-2)
+
+    def __format__(self, especificacao):
+        if especificacao == '.2f':
+            return self.__str__()
+        if especificacao.endswith('f'):
+            return format(self.reais, especificacao)
+        return int.__format__(self, especificacao)
+
+    def __str__(self):
+        return formatar_centavos(self)
+
+    def __repr__(self):
+        return f'Centavos({int(self)})'
+
+def formatar_centavos(centavos):
+    reais, resto = divmod(centavos, 100) if centavos >= 0 else divmod(-centavos, 100)
+    return f'{reais}.{resto:02d}' if centavos >= 0 else f'-{reais}.{resto:02d}'
+
+def para_centavos(valor):
+    if isinstance(valor, Centavos):
+        return int(valor)
+    if isinstance(valor, int):
+        return valor * 100
+    try:
+        return int(Decimal(str(valor).strip().replace(',', '.')).scaleb(2).quantize(Decimal(1), ROUND_HALF_UP))
+    except (InvalidOperation, ValueError):
+        raise ErroValidacao(f'Valor monetário inválido: {valor!r}') from None
+
+def numero_finito(valor):
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool) and math.isfinite(valor)
+
+def em_pontos_base(fracao):
+    return round(fracao * PONTOS_BASE)
+
+def dividir_arredondando(numerador, divisor):
+    return (2 * numerador + divisor) // (2 * divisor)
+
+def aplicar_pontos_base(centavos, pontos_base):
+    return dividir_arredondando(centavos * pontos_base, PONTOS_BASE)
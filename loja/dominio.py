@@ -0,0 +1,256 @@
+import sys
+from itertools import islice
+
+from .dinheiro import PONTOS_BASE, aplicar_pontos_base, em_pontos_base, formatar_centavos
+from .interfaces import ProdutoInterface
+
+
+def internar(texto):
+    return sys.intern(texto) if type(texto) is str else texto
+
+class Base:
+    __slots__ = ('_nome', '_chave')
+
+    def __init__(self, nome, chave):
+        self._nome = nome
+        self._chave = chave
+
+    @property
+    def nome(self):
+        return self._nome
+
+    @property
+    def chave(self):
+        return self._chave
+
+    def __str__(self):
+        return f'{self._nome} - {self._chave}'
+    
+class TabelaPrecos:
+    TAXA_PADRAO = 0.30
+    PROMOCOES_PADRAO = {'lançamento': 0.10, 'fim de ano': 0.20}
+    __slots__ = ('_taxa', '_taxa_pb', '_promocoes', '_versao')
+
+    def __init__(self, taxa=TAXA_PADRAO, promocoes=None):
+        self._taxa = taxa
+        self._taxa_pb = em_pontos_base(taxa)
+        self._promocoes = dict(self.PROMOCOES_PADRAO if promocoes is None else promocoes)
+        self._versao = 0
+
+    @property
+    def taxa(self):
+        return self._taxa
+
+    @property
+    def taxa_pb(self):
+        return self._taxa_pb
+
+    @property
+    def promocoes(self):
+        return self._promocoes
+
+    @property
+    def versao(self):
+        return self._versao
+
+    def definir_taxa(self, taxa):
+        taxa_pb = em_pontos_base(taxa)
+        self._taxa = taxa
+        self._taxa_pb = taxa_pb
+        self._versao += 1
+
+    def definir_promocao(self, tipo_promocao, desconto):
+        self._promocoes[tipo_promocao] = desconto
+        self._versao += 1
+
+    def remover_promocao(self, tipo_promocao):
+        del self._promocoes[tipo_promocao]
+        self._versao += 1
+
+    def substituir_promocoes(self, promocoes):
+        self._promocoes = dict(promocoes)
+        self._versao += 1
+
+class Jogo(Base,ProdutoInterface):
+    __slots__ = ('_preco_original', '_plataforma', '_categoria', '_promocao', '_tipo_promocao',
+                 '_preco_final', '_versao_precos', '_tabela')
+
+    def __init__(self, nome, preco_original, empresa, plataforma=None, categoria=None, tabela=None):
+        super().__init__(nome, empresa)
+        self._tabela = tabela if tabela is not None else TabelaPrecos()
+        self._preco_original = preco_original
+        self._plataforma = internar(plataforma)
+        self._categoria = internar(categoria)
+        self._promocao = None
+        self._tipo_promocao = None
+        self._atualizar_precos()
+
+    @property
+    def empresa(self):
+        return self._chave
+
+    @property
+    def chave(self):
+        return self._chave.nome
+
+    @property
+    def tabela(self):
+        return self._tabela
+
+    @staticmethod
+    def definir_promocao_em_lote(produtos, tipo_promocao, tabela):
+        desconto = tabela.promocoes.get(tipo_promocao)
+        tipo_promocao = tipo_promocao if desconto else None
+        fator_taxa = PONTOS_BASE + tabela.taxa_pb
+        fator_desconto = PONTOS_BASE - em_pontos_base(desconto) if desconto else None
+        versao = tabela.versao
+        for produto in produtos:
+            produto._promocao = desconto
+            produto._tipo_promocao = tipo_promocao
+            preco_com_taxa = aplicar_pontos_base(produto._preco_original, fator_taxa)
+            produto._preco_final = aplicar_pontos_base(preco_com_taxa, fator_desconto) if desconto else preco_com_taxa
+            produto._versao_precos = versao
+
+    def aplicar_taxa_loja(self, preco):
+        return aplicar_pontos_base(preco, PONTOS_BASE + self._tabela._taxa_pb)
+
+    def _atualizar_precos(self):
+        if self._tipo_promocao is not None:
+            self._promocao = self._tabela._promocoes.get(self._tipo_promocao)
+        preco_com_taxa = self.aplicar_taxa_loja(self._preco_original)
+        if self._promocao:
+            self._preco_final = aplicar_pontos_base(preco_com_taxa, PONTOS_BASE - em_pontos_base(self._promocao))
+        else:
+            self._preco_final = preco_com_taxa
+        self._versao_precos = self._tabela._versao
+
+    def definir_promocao(self, tipo_promocao):
+        self._promocao = self._tabela._promocoes.get(tipo_promocao)
+        self._tipo_promocao = tipo_promocao if self._promocao else None
+        self._atualizar_precos()
+
+    def alterar_preco(self, novo_preco):
+        self._preco_original = novo_preco
+        self._atualizar_precos()
+
+    @property
+    def preco_com_taxa(self):
+        return self.aplicar_taxa_loja(self._preco_original)
+
+    def aplicar_promocao(self):
+        if self._versao_precos != self._tabela._versao:
+            self._atualizar_precos()
+        return self._preco_final
+
+    def get_nome(self):
+        return self._nome
+    
+    def __str__(self):
+        preco_final = self.aplicar_promocao()
+        preco_com_taxa = self.preco_com_taxa
+        return (f'Nome: {self._nome}, Empresa: {self.chave}, '
+                f'Plataforma: {self._plataforma or "N/A"}, Categoria: {self._categoria or "N/A"}, '
+                f'Preço Original: R${formatar_centavos(self._preco_original)}, '
+                f'Preço com Taxa: R${formatar_centavos(preco_com_taxa)}, '
+                f'Preço com Taxa e Desconto: R${formatar_centavos(preco_final)}')
+
+class Empresa(Base):
+    __slots__ = ('_produtos', '_posicoes', '_proxima_posicao')
+
+    def __init__(self, nome, chave):
+        super().__init__(internar(nome), chave)
+        self._produtos = {}
+        self._posicoes = {}
+        self._proxima_posicao = 0
+
+    @property
+    def produtos(self):
+        return self._produtos.values()
+
+    def adicionar_produto(self, produto):
+        posicao = self._proxima_posicao
+        self._proxima_posicao += 1
+        self._produtos[posicao] = produto
+        self._posicoes[produto.nome] = posicao
+
+    def remover_produto(self, nome_produto):
+        posicao = self._posicoes.pop(nome_produto, None)
+        if posicao is None:
+            return False
+        del self._produtos[posicao]
+        return True
+
+    def renomear_produto(self, nome_produto, novo_nome):
+        posicao = self._posicoes.pop(nome_produto, None)
+        if posicao is None:
+            return False
+        self._produtos[posicao]._nome = novo_nome
+        self._posicoes[novo_nome] = posicao
+        return True
+
+    def listar_produtos(self, offset=0, limite=None):
+        fim = None if limite is None else offset + limite
+        return [str(produto) for produto in islice(self._produtos.values(), offset, fim)]
+
+    def buscar_produto(self, nome_produto):
+        posicao = self._posicoes.get(nome_produto)
+        if posicao is None:
+            return None
+        return self._produtos[posicao]
+
+    def __str__(self):
+        return f'{self.nome} - CNPJ: {self.chave}'
+
+class Cliente(Base):
+    __slots__ = ('_idade', '_saldo', '_jogos_comprados')
+
+    def __init__(self, nome, chave, idade):
+        super().__init__(nome, chave)
+        self._idade = idade
+        self._saldo = 0
+        self._jogos_comprados = ()
+
+    @property
+    def nome(self):
+        return self._nome
+
+    @property
+    def chave(self):
+        return self._chave
+    
+    @property
+    def jogos_comprados(self):
+        return list(self._jogos_comprados)
+
+    def adicionar_saldo(self, valor):
+        self._saldo += valor
+
+    def remover_saldo(self, valor):
+        if self._saldo >= valor:
+            self._saldo -= valor
+            return True
+        return False
+    
+    def possui_jogo(self, nome_jogo):
+        return nome_jogo in self._jogos_comprados
+
+    def adicionar_jogo(self, nome_jogo):
+        if not self._jogos_comprados:
+            self._jogos_comprados = {}
+        self._jogos_comprados[nome_jogo] = None
+
+    def remover_jogo(self, nome_jogo):
+        if nome_jogo in self._jogos_comprados:
+            del self._jogos_comprados[nome_jogo]
+            return True
+        return False
+
+    def renomear_jogo(self, nome_jogo, novo_nome):
+        if nome_jogo in self._jogos_comprados:
+            self._jogos_comprados = {novo_nome if jogo == nome_jogo else jogo: None for jogo in self._jogos_comprados}
+
+    def listar_jogos(self):
+        return list(self._jogos_comprados)
+
+    def __str__(self):
+        return f'{self._nome} (CPF: {self._chave}, Idade: {self._idade}, Saldo: R${formatar_centavos(self._saldo)})'
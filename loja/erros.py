@@ -0,0 +1,17 @@
+class ErroLoja(Exception):
+    codigo = 'erro_loja'
+
+class ErroNaoEncontrado(ErroLoja, LookupError):
+    codigo = 'nao_encontrado'
+
+class ErroDuplicado(ErroLoja):
+    codigo = 'duplicado'
+
+class ErroValidacao(ErroLoja, ValueError):
+    codigo = 'valor_invalido'
+
+class ErroOperacaoNegada(ErroLoja):
+    codigo = 'operacao_negada'
+
+class ErroSaldoInsuficiente(ErroOperacaoNegada):
+    codigo = 'saldo_insuficiente'
@@ -0,0 +1,99 @@
+from abc import ABC, abstractmethod
+
+
+class LojaInterface(ABC):
+    
+    @abstractmethod
+    def cadastrar_empresa(self, nome, cnpj):
+        pass
+    
+    @abstractmethod
+    def excluir_empresa(self, cnpj):
+        pass
+    
+    @abstractmethod
+    def listar_empresa(self, offset=0, limite=None):
+        pass
+    
+    @abstractmethod
+    def editar_empresa(self, cnpj, novo_nome=None):
+        pass
+    
+    @abstractmethod
+    def cadastrar_cliente(self, nome, cpf, idade):
+        pass
+    
+    @abstractmethod
+    def excluir_cliente(self, cpf):
+        pass
+    
+    @abstractmethod
+    def listar_cliente(self, offset=0, limite=None):
+        pass
+    
+    @abstractmethod
+    def editar_cliente(self, cpf, novo_nome=None, nova_idade=None):
+        pass
+    
+    @abstractmethod
+    def cadastrar_produto(self, cnpj_empresa, nome_produto, preco, plataforma=None, categoria=None, tipo_promocao=None):
+        pass
+    
+    @abstractmethod
+    def excluir_produto(self, cnpj_empresa, nome_produto):
+        pass
+    
+    @abstractmethod
+    def listar_produto(self, offset=0, limite=None, plataforma=None, categoria=None, empresa=None, preco_min=None, preco_max=None):
+        pass
+    
+    @abstractmethod
+    def editar_produto(self, cnpj_empresa, nome_produto, novo_nome=None, novo_preco=None, nova_plataforma=None, nova_categoria=None, nova_promocao=None):
+        pass
+    
+    @abstractmethod
+    def comprar_jogo(self, cpf_cliente, nome_produto):
+        pass
+    
+    @abstractmethod
+    def comprar_jogos_em_lote(self, compras):
+        pass
+    
+    @abstractmethod
+    def exibir_historico_cliente(self, cpf_cliente):
+        pass
+    
+    @abstractmethod
+    def exibir_jogos_comprados(self, cpf_cliente):
+        pass
+    
+    @abstractmethod
+    def exibir_relatorio_financeiro(self):
+        pass
+    
+    @abstractmethod
+    def executar(self):
+        pass
+    
+class ProdutoInterface(ABC):
+    __slots__ = ()
+    
+    @abstractmethod
+    def nome(self):
+        pass
+    
+    @abstractmethod
+    def aplicar_taxa_loja(self, preco):
+        pass
+    
+    @abstractmethod
+    def aplicar_promocao(self):
+        pass
+    
+    @abstractmethod
+    def definir_promocao(self, tipo_promocao):
+        pass
+
+    @abstractmethod
+    def __str__(self):
+        pass
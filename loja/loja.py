@@ -0,0 +1,1255 @@
+import json
+import os
+import threading
+import time
+from array import array
+from contextlib import nullcontext
+from itertools import islice
+
+from .busca import IndiceBusca
+from .catalogo import escrever_catalogo
+from .concorrencia import Razao, TravaLeituraEscrita, TravaNula, apos_carga, escrita, leitura
+from .dinheiro import MARGEM_LUCRO_PB, Centavos, aplicar_pontos_base, numero_finito, para_centavos
+from .dominio import Cliente, Empresa, Jogo, TabelaPrecos, internar
+from .erros import ErroDuplicado, ErroLoja, ErroNaoEncontrado, ErroOperacaoNegada, ErroSaldoInsuficiente, ErroValidacao
+from .interfaces import LojaInterface
+from .metricas import Metricas, MetricasNulas
+from .persistencia import Diario, decodificar_registro, ler_registros
+from .resultados import Resultado, SaidaConsole, SaidaNula, formatar_historico, formatar_jogos_comprados
+from .vendas import RegistroVendas
+
+
+def validar_compras(compras):
+    pares = []
+    for compra in compras:
+        try:
+            cpf_cliente, nome_produto = compra
+            hash((cpf_cliente, nome_produto))
+        except (TypeError, ValueError):
+            raise ErroValidacao(f'Compra inválida no lote: {compra!r}') from None
+        pares.append((cpf_cliente, nome_produto))
+    return pares
+
+def paginar(itens, offset=0, limite=None):
+    for valor in (offset, 0 if limite is None else limite):
+        if not isinstance(valor, int) or isinstance(valor, bool) or valor < 0:
+            raise ErroValidacao('O offset e o limite devem ser inteiros não negativos.')
+    fim = None if limite is None else offset + limite
+    return [str(item) for item in islice(itens, offset, fim)]
+
+class Loja(LojaInterface):
+    OPERACOES_INSTRUMENTADAS = tuple(sorted(LojaInterface.__abstractmethods__)) + (
+        'adicionar_saldo', 'remover_saldo', 'remover_jogo_cliente', 'alterar_taxa_loja', 'buscar_jogos',
+        'contar_facetas', 'historico_cliente', 'relatorio_financeiro',
+        'importar_empresas', 'importar_clientes', 'importar_produtos', 'salvar_snapshot',
+        'definir_tipo_promocao', 'remover_tipo_promocao', 'aplicar_promocao_em_lote', 'reverter_promocao_em_lote',
+        'agendar_promocao', 'cancelar_promocao_agendada', 'processar_agenda', 'exportar_catalogo', 'mais_vendidos',
+        'vendas_entre', 'relatorio_periodo', 'serie_vendas',
+    )
+
+    def __init__(self, diretorio=None, intervalo_snapshot=10000, concorrente=False, saida=None, carregar_sob_demanda=False,
+                 agenda_automatica=True):
+        self._saida = saida if saida is not None else SaidaConsole()
+        self._metricas = MetricasNulas()
+        self._empresas = {}
+        self._empresas_por_nome = {}
+        self._clientes = {}
+        self._concorrente = concorrente
+        self._trava = TravaLeituraEscrita() if concorrente else TravaNula()
+        self._trava_registros = threading.Lock() if concorrente else nullcontext()
+        self._travas_clientes = {}
+        self._razao = Razao(16 if concorrente else 1)
+        self._precos = TabelaPrecos()
+        self._vendas = RegistroVendas()
+        self._historico_clientes = {}
+        self._catalogo = {}
+        self._produto_empresa = {}
+        self._compradores = {}
+        self._indice_busca = None
+        self._trava_indice = threading.Lock()
+        self._agenda = {}
+        self._proximo_id_agenda = 1
+        self._proximo_evento_agenda = float('inf')
+        self._agenda_automatica = agenda_automatica
+        self._diretorio = diretorio
+        self._diario = None
+        self._reproduzindo = False
+        self._intervalo_snapshot = intervalo_snapshot
+        self._operacoes_desde_snapshot = 0
+        self._carga_pendente = bool(diretorio)
+        self._trava_carga = threading.Lock()
+        self._thread_carga = None
+        self._erro_carga = None
+        if diretorio and not carregar_sob_demanda:
+            self.carregar()
+
+    @property
+    def carregada(self):
+        return not self._carga_pendente
+
+    def carregar(self):
+        if not self._carga_pendente or self._thread_carga is threading.current_thread():
+            return
+        with self._trava_carga:
+            if self._erro_carga is not None:
+                raise ErroLoja(f'Falha ao carregar os dados de {self._diretorio}: {self._erro_carga}') from self._erro_carga
+            if not self._carga_pendente:
+                return
+            self._thread_carga = threading.current_thread()
+            try:
+                self._abrir_persistencia()
+            except Exception as erro:
+                self._erro_carga = erro
+                raise
+            finally:
+                self._thread_carga = None
+            self._carga_pendente = False
+
+    def _abrir_persistencia(self):
+        os.makedirs(self._diretorio, exist_ok=True)
+        seq = 0
+        caminho_snapshot = os.path.join(self._diretorio, 'snapshot.json')
+        if os.path.exists(caminho_snapshot):
+            with open(caminho_snapshot, encoding='utf-8') as arquivo:
+                estado = json.load(arquivo)
+            self._restaurar_estado(estado)
+            seq = estado['seq']
+
+        self._diario = Diario(os.path.join(self._diretorio, 'diario.jsonl'), seq)
+        saida, self._saida = self._saida, SaidaNula()
+        self._reproduzindo = True
+        try:
+            for registro in self._diario.ler(seq):
+                getattr(self, registro['op'])(*registro['args'])
+                self._operacoes_desde_snapshot += 1
+        finally:
+            self._reproduzindo = False
+            self._saida = saida
+
+    @property
+    def saida(self):
+        return self._saida
+
+    @saida.setter
+    def saida(self, saida):
+        self._saida = saida
+
+    @property
+    def metricas(self):
+        return self._metricas
+
+    def ativar_metricas(self, metricas=None):
+        self.desativar_metricas()
+        self._metricas = metricas if metricas is not None else Metricas()
+        for nome in self.OPERACOES_INSTRUMENTADAS:
+            setattr(self, nome, self._metricas.instrumentar(nome, getattr(type(self), nome).__get__(self)))
+        return self._metricas
+
+    def desativar_metricas(self):
+        for nome in self.OPERACOES_INSTRUMENTADAS:
+            self.__dict__.pop(nome, None)
+        self._metricas = MetricasNulas()
+
+    def snapshot_metricas(self):
+        return self._metricas.snapshot()
+
+    def exposicao_metricas(self):
+        return self._metricas.exposicao()
+
+    def _emitir(self, operacao, modelo, **dados):
+        resultado = Resultado(operacao, modelo, **dados)
+        self._saida.emitir(resultado)
+        return resultado
+
+    def _registrar_operacao(self, operacao, *argumentos, concluir=True):
+        if self._diario is None or self._reproduzindo:
+            return 0
+        seq = self._diario.registrar(operacao, list(argumentos))
+        self._operacoes_desde_snapshot += 1
+        if concluir:
+            self._concluir_operacao(seq)
+        return seq
+
+    def _concluir_operacao(self, seq=None):
+        if self._diario is None or self._reproduzindo:
+            return
+        self._diario.confirmar(seq)
+        if self._operacoes_desde_snapshot >= self._intervalo_snapshot:
+            self.salvar_snapshot()
+
+    def _trava_cliente(self, cpf_cliente):
+        if not self._concorrente:
+            return self._trava_registros
+        trava = self._travas_clientes.get(cpf_cliente)
+        if trava is None:
+            trava = self._travas_clientes.setdefault(cpf_cliente, threading.Lock())
+        return trava
+
+    def _estado(self):
+        empresas = []
+        for empresa in self._empresas.values():
+            produtos = [[produto.nome, produto._preco_original, produto._plataforma, produto._categoria, produto._tipo_promocao]
+                        for produto in empresa.produtos]
+            empresas.append([empresa.nome, empresa.chave, produtos])
+        clientes = [[cliente.nome, cliente.chave, cliente._idade, cliente._saldo, cliente.listar_jogos()]
+                    for cliente in self._clientes.values()]
+        return {
+            'seq': self._diario.seq if self._diario else 0,
+            'moeda': 'centavos',
+            'taxa_loja': self._precos.taxa,
+            'promocoes': dict(self._precos.promocoes),
+            'agenda': list(self._agenda.values()),
+            'proximo_id_agenda': self._proximo_id_agenda,
+            'empresas': empresas,
+            'clientes': clientes,
+            'receita': self._razao.receita,
+            'lucro': self._razao.lucro,
+            'vendas': self._vendas.exportar(),
+        }
+
+    def _restaurar_estado(self, estado):
+        if estado.get('taxa_loja', self._precos.taxa) != self._precos.taxa:
+            self._precos.definir_taxa(estado['taxa_loja'])
+        if 'promocoes' in estado:
+            self._precos.substituir_promocoes(estado['promocoes'])
+        converter = int if estado.get('moeda') == 'centavos' else para_centavos
+        for nome, cnpj, produtos in estado['empresas']:
+            self.adicionar_empresa(Empresa(nome, cnpj))
+            for nome_produto, preco, plataforma, categoria, tipo_promocao in produtos:
+                self._adicionar_produto(cnpj, nome_produto, converter(preco), plataforma, categoria, tipo_promocao)
+        for nome, cpf, idade, saldo, jogos in estado['clientes']:
+            cliente = Cliente(nome, cpf, idade)
+            cliente._saldo = converter(saldo)
+            for nome_jogo in jogos:
+                cliente.adicionar_jogo(nome_jogo)
+                self._registrar_comprador(nome_jogo, cpf)
+            self.adicionar_cliente(cliente)
+        self._razao.definir(converter(estado['receita']), converter(estado['lucro']))
+        self._agenda = {item['id']: item for item in estado.get('agenda', [])}
+        self._proximo_id_agenda = estado.get('proximo_id_agenda', 1)
+        self._atualizar_proximo_evento()
+        vendas = estado['vendas']
+        if converter is not int:
+            vendas = dict(vendas, receita=[para_centavos(valor) for valor in vendas['receita']],
+                          lucro=[para_centavos(valor) for valor in vendas['lucro']])
+        self._vendas = RegistroVendas.importar(vendas)
+        for indice in range(len(self._vendas)):
+            self._historico_clientes.setdefault(self._vendas.valor('cliente', indice), array('l')).append(indice)
+
+    @escrita
+    def salvar_snapshot(self):
+        if self._diario is None:
+            return
+        self._diario.confirmar()
+        caminho = os.path.join(self._diretorio, 'snapshot.json')
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(self._estado(), arquivo, ensure_ascii=False)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
+        self._diario.reiniciar(self._diario.seq)
+        self._operacoes_desde_snapshot = 0
+
+    @leitura
+    def exportar_catalogo(self, caminho):
+        produtos = escrever_catalogo(caminho, list(self._empresas.values()), self._precos.promocoes, self._precos.taxa_pb,
+                                     self._diario.seq if self._diario else 0)
+        return self._emitir('exportar_catalogo', 'Catálogo com {produtos} produtos exportado para {caminho}.',
+                            produtos=produtos, caminho=caminho)
+
+    def fechar(self):
+        if self._diario is not None:
+            self._diario.fechar()
+            self._diario = None
+
+    def adicionar_empresa(self, empresa):
+        self._empresas[empresa.chave] = empresa
+        self._empresas_por_nome[empresa.nome] = empresa.chave
+
+    def adicionar_cliente(self, cliente):
+        self._clientes[cliente.chave] = cliente
+
+    @property
+    def _busca(self):
+        indice = self._indice_busca
+        if indice is None:
+            with self._trava_indice:
+                indice = self._indice_busca
+                if indice is None:
+                    indice = IndiceBusca()
+                    for produto in self._catalogo.values():
+                        indice.adicionar(produto)
+                    self._indice_busca = indice
+        return indice
+
+    def _indexar_produto(self, produto, cnpj_empresa):
+        self._catalogo[produto.nome] = produto
+        self._produto_empresa[produto.nome] = cnpj_empresa
+        if self._indice_busca is not None:
+            self._indice_busca.adicionar(produto)
+
+    def _remover_indice_produto(self, nome_produto):
+        self._catalogo.pop(nome_produto, None)
+        self._produto_empresa.pop(nome_produto, None)
+        if self._indice_busca is not None:
+            self._indice_busca.remover(nome_produto)
+
+    @leitura
+    def buscar_jogos(self, texto=None, trecho=None, plataforma=None, categoria=None, promocao=None, limite=50):
+        nomes = self._busca.buscar(texto, trecho, plataforma, categoria, promocao, limite)
+        return [self._catalogo[nome] for nome in nomes]
+
+    @leitura
+    def listar_busca(self, texto=None, trecho=None, plataforma=None, categoria=None, promocao=None, limite=50):
+        nomes = self._busca.buscar(texto, trecho, plataforma, categoria, promocao, limite)
+        return paginar(self._catalogo[nome] for nome in nomes)
+
+    @leitura
+    def contar_facetas(self, texto=None, trecho=None, plataforma=None, categoria=None, promocao=None):
+        return self._busca.contar_facetas(self._busca.buscar(texto, trecho, plataforma, categoria, promocao, None))
+
+    @apos_carga
+    def buscar_produto(self, nome_produto):
+        return self._catalogo.get(nome_produto)
+
+    @apos_carga
+    def produto_foi_comprado(self, nome_produto):
+        return bool(self._compradores.get(nome_produto))
+
+    def _registrar_comprador(self, nome_produto, cpf_cliente):
+        self._compradores.setdefault(nome_produto, set()).add(cpf_cliente)
+
+    def _renomear_compradores(self, nome_produto, novo_nome):
+        compradores = self._compradores.pop(nome_produto, None)
+        if compradores:
+            self._compradores[novo_nome] = compradores
+            for cpf in compradores:
+                self._clientes[cpf].renomear_jogo(nome_produto, novo_nome)
+
+    def remover_jogo_cliente(self, cpf_cliente, nome_jogo):
+        seq = self._remover_jogo_cliente(cpf_cliente, nome_jogo)
+        self._concluir_operacao(seq)
+        return self._emitir('remover_jogo_cliente', 'Jogo {produto} removido da biblioteca do cliente {cpf}.',
+                            cpf=cpf_cliente, produto=nome_jogo)
+
+    @leitura
+    def _remover_jogo_cliente(self, cpf_cliente, nome_jogo):
+        cliente = self._obter_cliente(cpf_cliente)
+        with self._trava_cliente(cpf_cliente):
+            if not cliente.remover_jogo(nome_jogo):
+                raise ErroNaoEncontrado(f'O cliente não possui o jogo {nome_jogo}.')
+            with self._trava_registros:
+                compradores = self._compradores.get(nome_jogo)
+                if compradores:
+                    compradores.discard(cpf_cliente)
+                    if not compradores:
+                        del self._compradores[nome_jogo]
+                return self._registrar_operacao('remover_jogo_cliente', cpf_cliente, nome_jogo, concluir=False)
+
+    def adicionar_saldo(self, cpf_cliente, valor):
+        return self._movimentar_saldo('adicionar_saldo', cpf_cliente, valor)
+
+    def remover_saldo(self, cpf_cliente, valor):
+        return self._movimentar_saldo('remover_saldo', cpf_cliente, valor)
+
+    def _movimentar_saldo(self, operacao, cpf_cliente, valor):
+        seq, saldo = self._alterar_saldo(operacao, cpf_cliente, valor)
+        self._concluir_operacao(seq)
+        if operacao == 'adicionar_saldo':
+            modelo = 'Saldo adicionado com sucesso. Novo saldo: R${saldo:.2f}'
+        else:
+            modelo = 'Saldo removido com sucesso. Novo saldo: R${saldo:.2f}'
+        return self._emitir(operacao, modelo, cpf=cpf_cliente, valor=Centavos(para_centavos(valor)), saldo=Centavos(saldo))
+
+    @leitura
+    def _alterar_saldo(self, operacao, cpf_cliente, valor):
+        cliente = self._obter_cliente(cpf_cliente)
+        centavos = para_centavos(valor)
+        if centavos < 0:
+            raise ErroValidacao('O valor deve ser positivo.')
+        with self._trava_cliente(cpf_cliente):
+            if operacao == 'adicionar_saldo':
+                cliente.adicionar_saldo(centavos)
+            elif not cliente.remover_saldo(centavos):
+                raise ErroSaldoInsuficiente('Saldo insuficiente para a remoção.')
+            return self._registrar_operacao(operacao, cpf_cliente, str(Centavos(centavos)), concluir=False), cliente._saldo
+
+    @property
+    @apos_carga
+    def historico(self):
+        return self._vendas
+
+    @leitura
+    def historico_cliente(self, cpf_cliente):
+        return [self._vendas.linha(indice) for indice in self._historico_clientes.get(cpf_cliente, ())]
+
+    @apos_carga
+    def relatorio_financeiro(self, por=None):
+        if por is not None and por not in RegistroVendas.DIMENSOES:
+            raise ErroValidacao(f'Dimensão de relatório inválida: {por}')
+        with self._trava_registros:
+            if por is None:
+                return self._vendas.totais()
+            return self._vendas.agrupar(por)
+
+    @apos_carga
+    def mais_vendidos(self, limite=10, por='produto', criterio='quantidade', inicio=None, fim=None):
+        if por not in RegistroVendas.DIMENSOES:
+            raise ErroValidacao(f'Dimensão de relatório inválida: {por}')
+        if criterio not in RegistroVendas.CRITERIOS:
+            raise ErroValidacao(f'Critério de classificação inválido: {criterio}')
+        if not isinstance(limite, int) or limite < 1:
+            raise ErroValidacao('O limite deve ser um inteiro positivo.')
+        self._validar_periodo(inicio, fim)
+        with self._trava_registros:
+            return self._vendas.mais_vendidos(limite, por, criterio, inicio, fim)
+
+    def _validar_periodo(self, inicio, fim):
+        if inicio is not None and fim is not None and fim < inicio:
+            raise ErroValidacao('O fim do período deve ser posterior ao início.')
+
+    @apos_carga
+    def vendas_entre(self, inicio=None, fim=None, limite=None):
+        self._validar_periodo(inicio, fim)
+        if limite is not None and (not isinstance(limite, int) or limite < 1):
+            raise ErroValidacao('O limite deve ser um inteiro positivo.')
+        with self._trava_registros:
+            return self._vendas.vendas_entre(inicio, fim, limite)
+
+    @apos_carga
+    def relatorio_periodo(self, inicio=None, fim=None, por=None):
+        if por is not None and por not in RegistroVendas.DIMENSOES:
+            raise ErroValidacao(f'Dimensão de relatório inválida: {por}')
+        self._validar_periodo(inicio, fim)
+        with self._trava_registros:
+            if por is None:
+                return self._vendas.totais_entre(inicio, fim)
+            return self._vendas.agrupar_periodo(por, inicio, fim)
+
+    @apos_carga
+    def serie_vendas(self, granularidade='hora', inicio=None, fim=None):
+        if granularidade not in RegistroVendas.GRANULARIDADES:
+            raise ErroValidacao(f'Granularidade inválida: {granularidade}')
+        self._validar_periodo(inicio, fim)
+        with self._trava_registros:
+            return self._vendas.serie(granularidade, inicio, fim)
+
+    @apos_carga
+    def empresa_do_produto(self, nome_produto):
+        cnpj = self._produto_empresa.get(nome_produto)
+        if cnpj is None:
+            return None
+        return self._empresas.get(cnpj)
+
+    def _obter_empresa(self, cnpj):
+        empresa = self._empresas.get(cnpj)
+        if not empresa:
+            raise ErroNaoEncontrado('Empresa não encontrada.')
+        return empresa
+
+    def _obter_cliente(self, cpf):
+        cliente = self._clientes.get(cpf)
+        if not cliente:
+            raise ErroNaoEncontrado('Cliente não encontrado.')
+        return cliente
+
+    def _validar_empresa(self, nome, cnpj):
+        if cnpj in self._empresas:
+            raise ErroDuplicado(f'Já existe uma empresa cadastrada com o CNPJ {cnpj}.')
+        if nome in self._empresas_por_nome:
+            raise ErroDuplicado(f'Já existe uma empresa cadastrada com o nome {nome}.')
+
+    @escrita
+    def cadastrar_empresa(self, nome, cnpj):
+        self._validar_empresa(nome, cnpj)
+        empresa = Empresa(nome, cnpj)
+        self.adicionar_empresa(empresa)
+        self._registrar_operacao('cadastrar_empresa', nome, cnpj)
+        return self._emitir('cadastrar_empresa', 'Empresa {nome} cadastrada com sucesso.', nome=nome, cnpj=cnpj)
+
+    @escrita
+    def excluir_empresa(self, cnpj):
+        empresa = self._obter_empresa(cnpj)
+        for produto in empresa.produtos:
+            self._remover_indice_produto(produto.nome)
+        del self._empresas[cnpj]
+        del self._empresas_por_nome[empresa.nome]
+        self._registrar_operacao('excluir_empresa', cnpj)
+        return self._emitir('excluir_empresa', 'Empresa removida com sucesso.', cnpj=cnpj)
+
+    @apos_carga
+    def iterar_empresas(self):
+        return iter(self._empresas.values())
+
+    @leitura
+    def listar_empresa(self, offset=0, limite=None):
+        return paginar(self.iterar_empresas(), offset, limite)
+
+    @escrita
+    def editar_empresa(self, cnpj, novo_nome=None):
+        empresa = self._obter_empresa(cnpj)
+        if novo_nome and novo_nome != empresa.nome:
+            if novo_nome in self._empresas_por_nome:
+                raise ErroDuplicado(f'Já existe uma empresa cadastrada com o nome {novo_nome}.')
+            del self._empresas_por_nome[empresa.nome]
+            empresa._nome = internar(novo_nome)
+            self._empresas_por_nome[novo_nome] = cnpj
+            self._registrar_operacao('editar_empresa', cnpj, novo_nome)
+        return self._emitir('editar_empresa', 'Empresa editada com sucesso.', cnpj=cnpj, nome=empresa.nome)
+
+    def _validar_cliente(self, nome, cpf, idade):
+        if cpf in self._clientes:
+            raise ErroDuplicado(f'CPF {cpf} já cadastrado .')
+        if idade < 18:
+            raise ErroValidacao(f'Cliente {nome} não pode ser cadastrado, idade menor que 18 anos.')
+
+    @escrita
+    def cadastrar_cliente(self, nome, cpf, idade):
+        self._validar_cliente(nome, cpf, idade)
+        cliente = Cliente(nome, cpf, idade)
+        self.adicionar_cliente(cliente)
+        self._registrar_operacao('cadastrar_cliente', nome, cpf, idade)
+        return self._emitir('cadastrar_cliente', 'Cliente {nome} cadastrado com sucesso.', nome=nome, cpf=cpf)
+
+    @escrita
+    def excluir_cliente(self, cpf):
+        cliente = self._obter_cliente(cpf)
+        if cliente._jogos_comprados:
+            raise ErroOperacaoNegada('Cliente não pode ser removido porque possui jogos comprados.')
+        del self._clientes[cpf]
+        self._registrar_operacao('excluir_cliente', cpf)
+        return self._emitir('excluir_cliente', 'Cliente removido com sucesso.', cpf=cpf)
+
+    @apos_carga
+    def iterar_clientes(self):
+        return iter(self._clientes.values())
+
+    @leitura
+    def listar_cliente(self, offset=0, limite=None):
+        return paginar(self.iterar_clientes(), offset, limite)
+    
+    @escrita
+    def editar_cliente(self, cpf, novo_nome=None, nova_idade=None):
+        cliente = self._clientes.get(cpf)
+        if not cliente:
+            raise ErroNaoEncontrado(f'Cliente com CPF {cpf} não encontrado.')
+        if nova_idade is not None and not (isinstance(nova_idade, int) and nova_idade > 17):
+            raise ErroValidacao('Idade deve ser 18 anos ou mais')
+
+        if novo_nome is not None:
+            cliente._nome = novo_nome
+        if nova_idade is not None:
+            cliente._idade = nova_idade
+        
+        self._registrar_operacao('editar_cliente', cpf, novo_nome, nova_idade)
+        return self._emitir('editar_cliente', 'Cliente com CPF {cpf} atualizado com sucesso.', cpf=cpf)
+            
+    @escrita
+    def alterar_taxa_loja(self, taxa):
+        if not numero_finito(taxa) or taxa < 0:
+            raise ErroValidacao('A taxa da loja deve ser um valor positivo.')
+        self._precos.definir_taxa(taxa)
+        self._registrar_operacao('alterar_taxa_loja', taxa)
+        return self._emitir('alterar_taxa_loja', 'Taxa da loja alterada para {taxa:.0%}.', taxa=taxa)
+
+    def _validar_produto(self, cnpj_empresa, nome_produto, preco, tipo_promocao=None):
+        self._obter_empresa(cnpj_empresa)
+        if nome_produto in self._catalogo:
+            dona = self.empresa_do_produto(nome_produto)
+            raise ErroDuplicado(f'O produto {nome_produto} já está cadastrado para a empresa {dona._nome}.')
+        if preco < 0:
+            raise ErroValidacao('O preço deve ser um valor positivo.')
+        if tipo_promocao and tipo_promocao not in self._precos.promocoes:
+            raise ErroValidacao(f'Tipo de promoção {tipo_promocao} inválido.')
+
+    def _adicionar_produto(self, cnpj_empresa, nome_produto, preco, plataforma=None, categoria=None, tipo_promocao=None):
+        empresa = self._empresas[cnpj_empresa]
+        novo_jogo = Jogo(nome_produto, preco, empresa, plataforma, categoria, self._precos)
+        if tipo_promocao:
+            novo_jogo.definir_promocao(tipo_promocao)
+        empresa.adicionar_produto(novo_jogo)
+        self._indexar_produto(novo_jogo, cnpj_empresa)
+        return novo_jogo
+
+    @escrita
+    def cadastrar_produto(self, cnpj_empresa, nome_produto, preco, plataforma=None, categoria=None, tipo_promocao=None):
+        preco = para_centavos(preco)
+        self._validar_produto(cnpj_empresa, nome_produto, preco, tipo_promocao)
+        produto = self._adicionar_produto(cnpj_empresa, nome_produto, preco, plataforma, categoria, tipo_promocao)
+        self._registrar_operacao('cadastrar_produto', cnpj_empresa, nome_produto, str(Centavos(preco)), plataforma, categoria, tipo_promocao)
+        return self._emitir('cadastrar_produto', 'Produto {nome} cadastrado com sucesso para a empresa {empresa}.',
+                            nome=nome_produto, empresa=produto.empresa.nome, cnpj=cnpj_empresa)
+   
+    @escrita
+    def excluir_produto(self, cnpj_empresa, nome_produto):
+        empresa = self._obter_empresa(cnpj_empresa)
+        with self._metricas.etapa('excluir_produto.verificar_compradores'):
+            comprado = self.produto_foi_comprado(nome_produto)
+        if comprado:
+            raise ErroOperacaoNegada('Não é possível excluir o produto, pois ele foi comprado por um cliente.')
+
+        if not empresa.remover_produto(nome_produto):
+            raise ErroNaoEncontrado('Produto não encontrado.')
+        self._remover_indice_produto(nome_produto)
+        self._registrar_operacao('excluir_produto', cnpj_empresa, nome_produto)
+        return self._emitir('excluir_produto', 'Produto removido com sucesso.', cnpj=cnpj_empresa, nome=nome_produto)
+
+    def _importar(self, caminho, processar, tamanho_lote, max_erros):
+        return self._importar_lotes(ler_registros(caminho, tamanho_lote), processar, max_erros)
+
+    def _importar_lotes(self, lotes, processar, max_erros):
+        resumo = {'aceitos': 0, 'rejeitados': 0, 'erros': []}
+        for lote in lotes:
+            for linha, registro in lote:
+                try:
+                    processar(decodificar_registro(registro))
+                    erro = None
+                except ErroLoja as excecao:
+                    erro = str(excecao)
+                except (KeyError, TypeError, ValueError) as excecao:
+                    erro = f'Registro inválido: {excecao!r}'
+                if erro:
+                    resumo['rejeitados'] += 1
+                    if len(resumo['erros']) < max_erros:
+                        resumo['erros'].append((linha, erro))
+                else:
+                    resumo['aceitos'] += 1
+            self._concluir_operacao()
+        return resumo
+
+    @escrita
+    def importar_empresas(self, caminho, tamanho_lote=10000, max_erros=1000):
+        def processar(registro):
+            nome, cnpj = registro['nome'], registro['cnpj']
+            self._validar_empresa(nome, cnpj)
+            self.adicionar_empresa(Empresa(nome, cnpj))
+            self._registrar_operacao('cadastrar_empresa', nome, cnpj, concluir=False)
+        return self._importar(caminho, processar, tamanho_lote, max_erros)
+
+    def _importar_cliente(self, registro):
+        nome, cpf, idade = registro['nome'], registro['cpf'], int(registro['idade'])
+        self._validar_cliente(nome, cpf, idade)
+        self.adicionar_cliente(Cliente(nome, cpf, idade))
+        self._registrar_operacao('cadastrar_cliente', nome, cpf, idade, concluir=False)
+
+    @escrita
+    def importar_clientes(self, caminho, tamanho_lote=10000, max_erros=1000):
+        return self._importar(caminho, self._importar_cliente, tamanho_lote, max_erros)
+
+    @escrita
+    def importar_registros_clientes(self, registros, max_erros=1000):
+        return self._importar_lotes([registros], self._importar_cliente, max_erros)
+
+    @escrita
+    def importar_produtos(self, caminho, tamanho_lote=10000, max_erros=1000):
+        def processar(registro):
+            cnpj_empresa, nome_produto, preco = registro['cnpj_empresa'], registro['nome'], para_centavos(registro['preco'])
+            plataforma = registro.get('plataforma') or None
+            categoria = registro.get('categoria') or None
+            tipo_promocao = registro.get('promocao') or None
+            self._validar_produto(cnpj_empresa, nome_produto, preco, tipo_promocao)
+            self._adicionar_produto(cnpj_empresa, nome_produto, preco, plataforma, categoria, tipo_promocao)
+            self._registrar_operacao('cadastrar_produto', cnpj_empresa, nome_produto, str(Centavos(preco)), plataforma, categoria, tipo_promocao, concluir=False)
+        return self._importar(caminho, processar, tamanho_lote, max_erros)
+
+    @apos_carga
+    def iterar_produtos(self, plataforma=None, categoria=None, empresa=None, preco_min=None, preco_max=None):
+        preco_min = None if preco_min is None else para_centavos(preco_min)
+        preco_max = None if preco_max is None else para_centavos(preco_max)
+        if empresa is not None:
+            dona = self._empresas.get(empresa)
+            empresas = [dona] if dona else []
+        else:
+            empresas = self._empresas.values()
+        for dona in empresas:
+            for produto in dona.produtos:
+                if plataforma is not None and produto._plataforma != plataforma:
+                    continue
+                if categoria is not None and produto._categoria != categoria:
+                    continue
+                if preco_min is not None or preco_max is not None:
+                    preco_final = produto.aplicar_promocao()
+                    if preco_min is not None and preco_final < preco_min:
+                        continue
+                    if preco_max is not None and preco_final > preco_max:
+                        continue
+                yield produto
+
+    @leitura
+    def listar_produto(self, offset=0, limite=None, plataforma=None, categoria=None, empresa=None, preco_min=None, preco_max=None):
+        produtos = self.iterar_produtos(plataforma, categoria, empresa, preco_min, preco_max)
+        return paginar(produtos, offset, limite)
+
+    @escrita
+    def editar_produto(self, cnpj_empresa, nome_produto, novo_nome=None, novo_preco=None, nova_plataforma=None, nova_categoria=None, nova_promocao=None):
+        empresa = self._obter_empresa(cnpj_empresa)
+        produto = empresa.buscar_produto(nome_produto)
+        if not produto:
+            raise ErroNaoEncontrado('Produto não encontrado.')
+        if novo_preco is not None:
+            novo_preco = para_centavos(novo_preco)
+            if novo_preco < 0:
+                raise ErroValidacao('O preço deve ser um valor positivo.')
+        if nova_promocao and not self._reproduzindo:
+            self._validar_tipo_promocao(nova_promocao)
+        if novo_nome and novo_nome != nome_produto:
+            if novo_nome in self._catalogo:
+                raise ErroDuplicado(f'Já existe um produto cadastrado com o nome {novo_nome}.')
+            self._remover_indice_produto(nome_produto)
+            empresa.renomear_produto(nome_produto, novo_nome)
+            self._indexar_produto(produto, cnpj_empresa)
+            self._renomear_compradores(nome_produto, novo_nome)
+        if novo_preco is not None:
+            produto.alterar_preco(novo_preco)
+        if nova_plataforma:
+            produto._plataforma = internar(nova_plataforma)
+        if nova_categoria:
+            produto._categoria = internar(nova_categoria)
+        if nova_promocao is not None:
+            produto.definir_promocao(nova_promocao)
+        if self._indice_busca is not None:
+            self._indice_busca.adicionar(produto)
+            
+        self._registrar_operacao('editar_produto', cnpj_empresa, nome_produto, novo_nome,
+                                 None if novo_preco is None else str(Centavos(novo_preco)), nova_plataforma, nova_categoria, nova_promocao)
+        return self._emitir('editar_produto', 'Produto editado com sucesso.', cnpj=cnpj_empresa, nome=produto.nome)
+   
+    def _validar_tipo_promocao(self, tipo_promocao):
+        if tipo_promocao not in self._precos.promocoes:
+            raise ErroValidacao(f'Tipo de promoção {tipo_promocao} inválido.')
+
+    @escrita
+    def definir_tipo_promocao(self, tipo_promocao, desconto):
+        if not tipo_promocao:
+            raise ErroValidacao('O tipo de promoção deve ter um nome.')
+        if not 0 < desconto < 1:
+            raise ErroValidacao('O desconto deve estar entre 0 e 1.')
+        self._precos.definir_promocao(tipo_promocao, desconto)
+        self._registrar_operacao('definir_tipo_promocao', tipo_promocao, desconto)
+        return self._emitir('definir_tipo_promocao', 'Promoção {tipo} definida com desconto de {desconto:.0%}.',
+                            tipo=tipo_promocao, desconto=desconto)
+
+    @escrita
+    def remover_tipo_promocao(self, tipo_promocao):
+        if tipo_promocao not in self._precos.promocoes:
+            raise ErroNaoEncontrado(f'Tipo de promoção {tipo_promocao} não encontrado.')
+        if self._busca.nomes_da_faceta('promocao', tipo_promocao):
+            raise ErroOperacaoNegada(f'A promoção {tipo_promocao} ainda está aplicada a produtos.')
+        if any(item['tipo'] == tipo_promocao for item in self._agenda.values()):
+            raise ErroOperacaoNegada(f'A promoção {tipo_promocao} possui agendamentos pendentes.')
+        self._precos.remover_promocao(tipo_promocao)
+        self._registrar_operacao('remover_tipo_promocao', tipo_promocao)
+        return self._emitir('remover_tipo_promocao', 'Promoção {tipo} removida.', tipo=tipo_promocao)
+
+    def _produtos_do_segmento(self, empresa=None, categoria=None, plataforma=None, promocao=None):
+        if empresa is not None:
+            produtos = self._obter_empresa(empresa).produtos
+        else:
+            indices = [self._busca.nomes_da_faceta(faceta, valor)
+                       for faceta, valor in (('categoria', categoria), ('plataforma', plataforma), ('promocao', promocao))
+                       if valor is not None]
+            if indices:
+                produtos = [self._catalogo[nome] for nome in min(indices, key=len)]
+            else:
+                produtos = self._catalogo.values()
+        return [produto for produto in produtos
+                if (categoria is None or produto._categoria == categoria)
+                and (plataforma is None or produto._plataforma == plataforma)
+                and (promocao is None or produto._tipo_promocao == promocao)]
+
+    def _definir_promocao_no_segmento(self, tipo_promocao, produtos):
+        Jogo.definir_promocao_em_lote(produtos, tipo_promocao, self._precos)
+        if self._indice_busca is not None:
+            atualizar_faceta = self._indice_busca.atualizar_faceta
+            for produto in produtos:
+                atualizar_faceta(produto.nome, 'promocao', produto._tipo_promocao)
+        return len(produtos)
+
+    @escrita
+    def aplicar_promocao_em_lote(self, tipo_promocao, empresa=None, categoria=None, plataforma=None):
+        self._validar_tipo_promocao(tipo_promocao)
+        produtos = self._produtos_do_segmento(empresa, categoria, plataforma)
+        quantidade = self._definir_promocao_no_segmento(tipo_promocao, produtos)
+        self._registrar_operacao('aplicar_promocao_em_lote', tipo_promocao, empresa, categoria, plataforma)
+        return self._emitir('aplicar_promocao_em_lote', 'Promoção {tipo} aplicada a {quantidade} produtos.',
+                            tipo=tipo_promocao, quantidade=quantidade)
+
+    @escrita
+    def reverter_promocao_em_lote(self, empresa=None, categoria=None, plataforma=None, tipo_promocao=None):
+        produtos = [produto for produto in self._produtos_do_segmento(empresa, categoria, plataforma, tipo_promocao)
+                    if produto._tipo_promocao is not None]
+        quantidade = self._definir_promocao_no_segmento(None, produtos)
+        self._registrar_operacao('reverter_promocao_em_lote', empresa, categoria, plataforma, tipo_promocao)
+        return self._emitir('reverter_promocao_em_lote', 'Promoção removida de {quantidade} produtos.', quantidade=quantidade)
+
+    @escrita
+    def agendar_promocao(self, tipo_promocao, inicio, fim, empresa=None, categoria=None, plataforma=None):
+        self._validar_tipo_promocao(tipo_promocao)
+        if not (numero_finito(inicio) and numero_finito(fim)):
+            raise ErroValidacao('O início e o fim da promoção devem ser instantes numéricos.')
+        if fim <= inicio:
+            raise ErroValidacao('O fim da promoção deve ser posterior ao início.')
+        if empresa is not None:
+            self._obter_empresa(empresa)
+        identificador = self._proximo_id_agenda
+        self._proximo_id_agenda += 1
+        self._agenda[identificador] = {
+            'id': identificador, 'tipo': tipo_promocao, 'inicio': inicio, 'fim': fim,
+            'empresa': empresa, 'categoria': categoria, 'plataforma': plataforma, 'ativa': False, 'anteriores': {},
+        }
+        self._registrar_operacao('agendar_promocao', tipo_promocao, inicio, fim, empresa, categoria, plataforma)
+        self._atualizar_proximo_evento()
+        if self._agenda_automatica and not self._reproduzindo:
+            self._processar_agenda(time.time())
+        return self._emitir('agendar_promocao', 'Promoção {tipo} agendada (id {id}).', id=identificador, tipo=tipo_promocao)
+
+    @escrita
+    def cancelar_promocao_agendada(self, identificador):
+        item = self._agenda.pop(identificador, None)
+        if item is None:
+            raise ErroNaoEncontrado(f'Agendamento {identificador} não encontrado.')
+        if item['ativa']:
+            self._encerrar_agendamento(item)
+        self._atualizar_proximo_evento()
+        self._registrar_operacao('cancelar_promocao_agendada', identificador)
+        return self._emitir('cancelar_promocao_agendada', 'Agendamento {id} cancelado.', id=identificador)
+
+    def _agendamento_vigente(self, produto, tipo_promocao=None):
+        vigentes = [item for item in self._agenda.values()
+                    if item['ativa'] and (tipo_promocao is None or item['tipo'] == tipo_promocao)
+                    and (item['empresa'] is None or produto.empresa.chave == item['empresa'])
+                    and (item['categoria'] is None or produto._categoria == item['categoria'])
+                    and (item['plataforma'] is None or produto._plataforma == item['plataforma'])]
+        return max(vigentes, key=lambda item: (item['inicio'], item['id']), default=None)
+
+    def _ativar_agendamento(self, item):
+        produtos = self._produtos_do_segmento(item['empresa'], item['categoria'], item['plataforma'])
+        anteriores = {}
+        for produto in produtos:
+            if produto._tipo_promocao is None:
+                continue
+            dono = self._agendamento_vigente(produto, produto._tipo_promocao)
+            anterior = produto._tipo_promocao if dono is None else dono['anteriores'].get(produto.nome)
+            if anterior is not None:
+                anteriores[produto.nome] = anterior
+        item['anteriores'] = anteriores
+        return self._definir_promocao_no_segmento(item['tipo'], produtos)
+
+    def _encerrar_agendamento(self, item):
+        if item['empresa'] is not None and item['empresa'] not in self._empresas:
+            return 0
+        produtos = self._produtos_do_segmento(item['empresa'], item['categoria'], item['plataforma'], item['tipo'])
+        anteriores = item['anteriores']
+        grupos = {}
+        for produto in produtos:
+            dono = self._agendamento_vigente(produto)
+            tipo_promocao = anteriores.get(produto.nome) if dono is None else dono['tipo']
+            grupos.setdefault(tipo_promocao, []).append(produto)
+        return sum(self._definir_promocao_no_segmento(tipo_promocao, grupo) for tipo_promocao, grupo in grupos.items())
+
+    def _atualizar_proximo_evento(self):
+        self._proximo_evento_agenda = min(
+            (item['fim'] if item['ativa'] else item['inicio'] for item in self._agenda.values()), default=float('inf'))
+
+    def _processar_agenda(self, agora):
+        alterados = 0
+        encerrados = [item for item in self._agenda.values() if item['fim'] <= agora]
+        for item in encerrados:
+            del self._agenda[item['id']]
+        for item in sorted(encerrados, key=lambda item: (item['inicio'], item['id'])):
+            if item['ativa']:
+                alterados += self._encerrar_agendamento(item)
+        mudou = bool(encerrados)
+        for item in sorted(self._agenda.values(), key=lambda item: (item['inicio'], item['id'])):
+            if not item['ativa'] and item['inicio'] <= agora:
+                if item['empresa'] is None or item['empresa'] in self._empresas:
+                    alterados += self._ativar_agendamento(item)
+                item['ativa'] = True
+                mudou = True
+        if mudou:
+            self._atualizar_proximo_evento()
+            self._registrar_operacao('processar_agenda', agora)
+        return alterados
+
+    @escrita
+    def processar_agenda(self, agora=None):
+        agora = time.time() if agora is None else agora
+        alterados = self._processar_agenda(agora)
+        return self._emitir('processar_agenda', 'Agenda de promoções processada: {alterados} produtos alterados.', alterados=alterados)
+
+    @apos_carga
+    def listar_agenda(self):
+        return [{chave: valor for chave, valor in item.items() if chave != 'anteriores'} for item in self._agenda.values()]
+
+    @apos_carga
+    def verificar_agenda(self):
+        if self._agenda_automatica and not self._reproduzindo and time.time() >= self._proximo_evento_agenda:
+            self.processar_agenda()
+
+    def _instante_da_compra(self, instante):
+        if instante is None:
+            return time.time()
+        if not self._reproduzindo:
+            raise ErroValidacao('O instante da compra é definido pela loja.')
+        return instante
+
+    def comprar_jogo(self, cpf_cliente, nome_produto, instante=None):
+        instante = self._instante_da_compra(instante)
+        self.verificar_agenda()
+        seq, cliente, preco_final = self._efetuar_compra(cpf_cliente, nome_produto, instante)
+        self._concluir_operacao(seq)
+        return self._emitir('comprar_jogo', 'Compra realizada com sucesso! Produto: {produto}, Valor: R${valor:.2f}, Cliente: {cliente}',
+                            cpf=cpf_cliente, cliente=cliente.nome, produto=nome_produto, valor=Centavos(preco_final))
+
+    @leitura
+    def _efetuar_compra(self, cpf_cliente, nome_produto, instante):
+        cliente = self._obter_cliente(cpf_cliente)
+        with self._metricas.etapa('comprar_jogo.busca_produto'):
+            produto = self._catalogo.get(nome_produto)
+        if not produto:
+            raise ErroNaoEncontrado('Produto não encontrado.')
+
+        with self._trava_cliente(cpf_cliente):
+            if cliente.possui_jogo(nome_produto):
+                raise ErroOperacaoNegada(f'O cliente já comprou o jogo {nome_produto} anteriormente.')
+
+            preco_final = produto.aplicar_promocao()
+            if not cliente.remover_saldo(preco_final):
+                raise ErroSaldoInsuficiente('Saldo insuficiente para realizar a compra.')
+
+            lucro = aplicar_pontos_base(preco_final, MARGEM_LUCRO_PB)
+            self._razao.adicionar(preco_final, lucro)
+            with self._trava_registros:
+                self._registrar_compra(cliente, produto, preco_final, lucro, instante)
+                seq = self._registrar_operacao('comprar_jogo', cpf_cliente, nome_produto, self._vendas.ultimo_instante,
+                                               concluir=False)
+
+        return seq, cliente, preco_final
+
+    def _registrar_compra(self, cliente, produto, preco_final, lucro, instante):
+        indice = self._vendas.registrar(
+            preco_final, lucro, instante,
+            cliente=cliente.chave, nome_cliente=cliente.nome, produto=produto.nome,
+            empresa=self._produto_empresa[produto.nome], categoria=produto._categoria,
+            plataforma=produto._plataforma, promocao=produto._tipo_promocao)
+        self._historico_clientes.setdefault(cliente.chave, array('l')).append(indice)
+        cliente.adicionar_jogo(produto.nome)
+        self._registrar_comprador(produto.nome, cliente.chave)
+
+    def comprar_jogos_em_lote(self, compras, instante=None):
+        instante = self._instante_da_compra(instante)
+        self.verificar_agenda()
+        resultados, seq = self._efetuar_compras_em_lote(compras, instante)
+        if seq:
+            self._concluir_operacao(seq)
+        return resultados
+
+    @leitura
+    def _efetuar_compras_em_lote(self, compras, instante):
+        compras = validar_compras(compras)
+        resultados = []
+        seq = 0
+        precos = {}
+        receita = 0
+        lucro = 0
+
+        try:
+            for cpf_cliente, nome_produto in compras:
+                resultado = {'cpf': cpf_cliente, 'produto': nome_produto, 'status': 'sucesso', 'valor': None}
+                resultados.append(resultado)
+
+                cliente = self._clientes.get(cpf_cliente)
+                if not cliente:
+                    resultado['status'] = 'cliente_nao_encontrado'
+                    continue
+
+                if nome_produto not in precos:
+                    produto = self._catalogo.get(nome_produto)
+                    precos[nome_produto] = (produto, produto.aplicar_promocao()) if produto else (None, None)
+                produto, preco_final = precos[nome_produto]
+                if produto is None:
+                    resultado['status'] = 'produto_nao_encontrado'
+                    continue
+
+                with self._trava_cliente(cpf_cliente):
+                    if cliente.possui_jogo(nome_produto):
+                        resultado['status'] = 'ja_comprado'
+                        continue
+
+                    if not cliente.remover_saldo(preco_final):
+                        resultado['status'] = 'saldo_insuficiente'
+                        continue
+
+                    lucro_venda = aplicar_pontos_base(preco_final, MARGEM_LUCRO_PB)
+                    receita += preco_final
+                    lucro += lucro_venda
+                    with self._trava_registros:
+                        self._registrar_compra(cliente, produto, preco_final, lucro_venda, instante)
+                        seq = self._registrar_operacao('comprar_jogos_em_lote', [[cpf_cliente, nome_produto]],
+                                                       self._vendas.ultimo_instante, concluir=False)
+                resultado['valor'] = Centavos(preco_final)
+        finally:
+            self._razao.adicionar(receita, lucro)
+        return resultados, seq
+
+    @leitura
+    def exibir_historico_cliente(self, cpf_cliente):
+        cliente = self._obter_cliente(cpf_cliente)
+        compras = [(nome_produto, preco_final) for _, _, nome_produto, preco_final in self.historico_cliente(cpf_cliente)
+                   if preco_final > 0]
+        return self._emitir('exibir_historico_cliente', formatar_historico, cliente=cliente.nome, compras=compras)
+
+    @leitura
+    def exibir_jogos_comprados(self, cpf_cliente):
+        cliente = self._obter_cliente(cpf_cliente)
+        return self._emitir('exibir_jogos_comprados', formatar_jogos_comprados, cliente=cliente.nome, jogos=cliente.listar_jogos())
+
+    @apos_carga
+    def exibir_relatorio_financeiro(self):
+        return self._emitir('exibir_relatorio_financeiro', '\nRelatório Financeiro:\nReceita Total: R${receita:.2f}\nLucro Total: R${lucro:.2f}',
+                            receita=self._razao.receita, lucro=self._razao.lucro)
+
+    def executar(self):
+        while True:
+            self.verificar_agenda()
+            self.mostrar_menu_principal()
+            opcao = input('Escolha uma opção: ')
+            
+            if opcao == '1':
+                self.menu_clientes()
+            elif opcao == '2':
+                self.menu_empresas()
+            elif opcao == '3':
+                self.menu_produtos()
+            elif opcao == '4':
+                self.menu_compras()
+            elif opcao == '5':
+                self.exibir_relatorio_financeiro()
+            elif opcao == '6':
+                print('Saindo do sistema...')
+                self.fechar()
+                break
+            else:
+                print('Opção inválida. Tente novamente.')
+
+    def _executar_no_menu(self, operacao, *argumentos):
+        try:
+            return operacao(*argumentos)
+        except ErroLoja as erro:
+            self._saida.emitir(erro)
+            return None
+
+    def _exibir_paginado(self, listar, vazio, tamanho_pagina=20):
+        offset = 0
+        while True:
+            pagina = listar(offset, tamanho_pagina)
+            if not pagina and offset == 0:
+                print(vazio)
+            for item in pagina:
+                print(item)
+            if len(pagina) < tamanho_pagina:
+                break
+            offset += tamanho_pagina
+            if input('Pressione Enter para a próxima página ou digite "s" para sair: ').lower() == 's':
+                break
+
+    def mostrar_menu_principal(self):
+        print('\n1. Menu Clientes\n2. Menu Empresas\n3. Menu Produtos\n4. Menu Compras\n5. Exibir Relatório Financeiro\n6. Sair\n')
+
+    def menu_clientes(self):
+        while True:
+            print('\n1. Cadastrar Cliente\n2. Editar Cliente\n3. Excluir Cliente\n4. Listar Clientes\n5. Listar Jogos do Cliente\n6. Adicionar Saldo\n7. Remover Saldo\n8. Voltar\n')
+            opcao = input('Escolha uma opção: ')
+            
+            if opcao == '1':
+                nome = input('Nome do Cliente: ')
+                cpf = input('CPF do Cliente: ')
+                
+                while True:
+                    try:
+                        idade = int(input('Idade do Cliente: '))
+                        if idade < 0:
+                            print('Idade deve ser um número positivo.')
+                        else:
+                            break
+                    except ValueError:
+                        print('Idade deve ser um número inteiro. Tente novamente.')
+                        
+                self._executar_no_menu(self.cadastrar_cliente, nome, cpf, idade)
+                
+            elif opcao == '2':
+                cpf = input('CPF do Cliente: ')
+                novo_nome = input('Novo Nome do Cliente: ')
+                
+                while True:
+                    nova_idade = input('Nova Idade do Cliente (deixe em branco para não alterar): ')
+                    if nova_idade == '':
+                        nova_idade = None
+                        break
+                    try:
+                        nova_idade = int(nova_idade)
+                        if nova_idade < 0:
+                            print('Idade deve ser um número positivo.')
+                        else:
+                            break
+                    except ValueError:
+                        print('Idade deve ser um número inteiro. Tente novamente.')
+            
+
+                        
+                self._executar_no_menu(self.editar_cliente, cpf, novo_nome, nova_idade)
+                
+            elif opcao == '3':
+                cpf = input('CPF do Cliente: ')
+                self._executar_no_menu(self.excluir_cliente, cpf)
+                
+            elif opcao == '4':
+                self._exibir_paginado(self.listar_cliente, 'Ainda não foi cadastrado nenhum cliente')
+                    
+            elif opcao == '5':
+                cpf_cliente = input('CPF do Cliente: ')
+                self._executar_no_menu(self.exibir_jogos_comprados, cpf_cliente)
+                
+            elif opcao == '6':
+                cpf_cliente = input('CPF do Cliente: ')
+                cliente = self._clientes.get(cpf_cliente)
+                if cliente:
+                    while True:
+                        try:
+                            valor = float(input("Digite o valor que deseja adicionar à sua Carteira Steam Verde: "))
+                            if valor < 0:
+                                print("O valor deve ser positivo.")
+                            else:
+                                self._executar_no_menu(self.adicionar_saldo, cpf_cliente, valor)
+                                break
+                        except ValueError:
+                            print("Digite um valor numérico válido.")
+                else:
+                    print("Cliente não encontrado.")
+                    
+            elif opcao == '7':
+                cpf_cliente = input('CPF do Cliente: ')
+                cliente = self._clientes.get(cpf_cliente)
+                if cliente:
+                    while True:
+                        try:
+                            valor = float(input("Digite o valor que deseja remover da sua Carteira Steam Verde: "))
+                            if valor < 0:
+                                print("O valor deve ser positivo.")
+                            else:
+                                self._executar_no_menu(self.remover_saldo, cpf_cliente, valor)
+                                break
+                        except ValueError:
+                            print("Digite um valor numérico válido.")
+                else:
+                    print("Cliente não encontrado.")
+                    
+            elif opcao == '8':
+                break
+                
+            else:
+                print('Opção inválida. Tente novamente.')
+
+    def menu_empresas(self):
+        while True:
+            print('\n1. Cadastrar Empresa\n2. Editar Empresa\n3. Excluir Empresa\n4. Listar Empresas\n5. Voltar\n')
+            opcao = input('Escolha uma opção: ')
+            
+            if opcao == '1':
+                nome = input('Nome da Empresa: ')
+                cnpj = input('CNPJ da Empresa: ')
+                self._executar_no_menu(self.cadastrar_empresa, nome, cnpj)
+            elif opcao == '2':
+                cnpj = input('CNPJ da Empresa: ')
+                novo_nome = input('Novo Nome da Empresa (deixe em branco para não alterar): ')
+                self._executar_no_menu(self.editar_empresa, cnpj, novo_nome)
+            elif opcao == '3':
+                cnpj = input('CNPJ da Empresa: ')
+                self._executar_no_menu(self.excluir_empresa, cnpj)
+            elif opcao == '4':
+                self._exibir_paginado(self.listar_empresa, 'Não existe nenhum cadastro ainda.')
+            elif opcao == '5':
+                break
+            else:
+                print('Opção inválida. Tente novamente.')
+
+    def menu_produtos(self):
+        while True:
+            print('\n1. Cadastrar Jogo\n2. Editar Jogo\n3. Excluir Jogo\n4. Listar Jogo\n5. Voltar\n')
+            opcao = input('Escolha uma opção: ')
+            
+            if opcao == '1':
+                cnpj_empresa = input('CNPJ da Empresa: ')
+                nome_produto = input('Nome do Jogo: ')
+                
+                while True:
+                    try:
+                        preco = float(input('Preço do Jogo: '))
+                        if preco < 0:
+                            print('O preço deve ser um valor positivo.')
+                        else:
+                            break
+                    except ValueError:
+                        print('Preço deve ser um número válido. Tente novamente.')
+                        
+                plataforma = input('Plataforma do Jogo: ')
+                categoria = input('Categoria do Jogo: ')
+                tipo_promocao = input('Tipo de Promoção (lançamento/fim de ano/deixe em branco para nenhuma): ')
+                self._executar_no_menu(self.cadastrar_produto, cnpj_empresa, nome_produto, preco, plataforma, categoria, tipo_promocao)
+            
+            elif opcao == '2':
+                cnpj_empresa = input('CNPJ da Empresa: ')
+                nome_produto = input('Nome do Jogo: ')
+                novo_nome = input('Novo Nome do Jogo (deixe em branco para não alterar): ')
+                
+                while True:
+                    novo_preco = input('Novo Preço do Jogo (deixe em branco para não alterar): ')
+                    if novo_preco == '':
+                        novo_preco = None
+                        break
+                    try:
+                        novo_preco = float(novo_preco)
+                        if novo_preco < 0:
+                            print('O preço deve ser um valor positivo.')
+                        else:
+                            break
+                    except ValueError:
+                        print('Preço deve ser um número válido. Tente novamente.')
+                        
+                nova_plataforma = input('Nova Plataforma do Jogo (deixe em branco para não alterar): ')
+                nova_categoria = input('Nova Categoria do Jogo (deixe em branco para não alterar): ')
+                nova_promocao = input('Nova Promoção do Jogo (lançamento/fim de ano/deixe em branco para nenhuma): ')
+                self._executar_no_menu(self.editar_produto, cnpj_empresa, nome_produto, novo_nome, novo_preco, nova_plataforma, nova_categoria, nova_promocao)
+            
+            elif opcao == '3':
+                cnpj_empresa = input('CNPJ da Empresa: ')
+                nome_produto = input('Nome do Jogo: ')
+                self._executar_no_menu(self.excluir_produto, cnpj_empresa, nome_produto)
+            
+            elif opcao == '4':
+                self._exibir_paginado(self.listar_produto, 'Não possui produto cadastrado ainda.')
+            
+            elif opcao == '5':
+                break
+            
+            else:
+                print('Opção inválida. Tente novamente.')
+
+
+    def menu_compras(self):
+        while True:
+            print('\n1. Comprar Jogo\n2. Exibir Histórico de Compras\n3. Voltar\n')
+            opcao = input('Escolha uma opção: ')
+            
+            if opcao == '1':
+                cpf_cliente = input("CPF do Cliente: ")
+                nome_produto = input("Nome do Jogo: ")
+                self._executar_no_menu(self.comprar_jogo, cpf_cliente, nome_produto)
+            elif opcao == '2':
+                cpf_cliente = input("CPF do Cliente: ")
+                self._executar_no_menu(self.exibir_historico_cliente, cpf_cliente)
+            elif opcao == '3':
+                break
+            else:
+                print('Opção inválida. Tente novamente.')
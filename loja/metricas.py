@@ -0,0 +1,146 @@
+import bisect
+import threading
+import time
+from contextlib import nullcontext
+from functools import wraps
+
+from .erros import ErroLoja
+
+
+class EstatisticaOperacao:
+    __slots__ = ('chamadas', 'rejeicoes', 'erros', 'soma_ns', 'maximo_ns', 'baldes')
+
+    def __init__(self, quantidade_baldes):
+        self.chamadas = 0
+        self.rejeicoes = 0
+        self.erros = 0
+        self.soma_ns = 0
+        self.maximo_ns = 0
+        self.baldes = [0] * quantidade_baldes
+
+class CronometroEtapa:
+    __slots__ = ('_metricas', '_nome', '_inicio')
+
+    def __init__(self, metricas, nome):
+        self._metricas = metricas
+        self._nome = nome
+
+    def __enter__(self):
+        self._inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, tipo, valor, rastro):
+        self._metricas.registrar(self._nome, time.perf_counter_ns() - self._inicio, valor)
+        return False
+
+class Metricas:
+    LIMITES_SEGUNDOS = (0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+                        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+    def __init__(self, prefixo='loja'):
+        self._prefixo = prefixo
+        self._limites_ns = [int(limite * 1e9) for limite in self.LIMITES_SEGUNDOS]
+        self._estatisticas = {}
+        self._trava = threading.Lock()
+
+    def registrar(self, nome, duracao_ns, erro=None):
+        balde = bisect.bisect_left(self._limites_ns, duracao_ns)
+        with self._trava:
+            estatistica = self._estatisticas.get(nome)
+            if estatistica is None:
+                estatistica = self._estatisticas[nome] = EstatisticaOperacao(len(self._limites_ns) + 1)
+            estatistica.chamadas += 1
+            estatistica.soma_ns += duracao_ns
+            if duracao_ns > estatistica.maximo_ns:
+                estatistica.maximo_ns = duracao_ns
+            estatistica.baldes[balde] += 1
+            if erro is not None:
+                if isinstance(erro, ErroLoja):
+                    estatistica.rejeicoes += 1
+                else:
+                    estatistica.erros += 1
+
+    def etapa(self, nome):
+        return CronometroEtapa(self, nome)
+
+    def instrumentar(self, nome, funcao):
+        registrar = self.registrar
+        relogio = time.perf_counter_ns
+
+        @wraps(funcao)
+        def instrumentada(*args, **kwargs):
+            inicio = relogio()
+            try:
+                resultado = funcao(*args, **kwargs)
+            except Exception as erro:
+                registrar(nome, relogio() - inicio, erro)
+                raise
+            registrar(nome, relogio() - inicio)
+            return resultado
+        return instrumentada
+
+    def _percentil(self, baldes, chamadas, maximo_ns, fracao):
+        alvo = fracao * chamadas
+        acumulado = 0
+        for limite, quantidade in zip(self.LIMITES_SEGUNDOS, baldes):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                return min(limite, maximo_ns / 1e9)
+        return maximo_ns / 1e9
+
+    def snapshot(self):
+        with self._trava:
+            estatisticas = {nome: (estatistica.chamadas, estatistica.rejeicoes, estatistica.erros, estatistica.soma_ns,
+                                   estatistica.maximo_ns, list(estatistica.baldes))
+                            for nome, estatistica in self._estatisticas.items()}
+        resumo = {}
+        for nome, (chamadas, rejeicoes, erros, soma_ns, maximo_ns, baldes) in sorted(estatisticas.items()):
+            resumo[nome] = {
+                'chamadas': chamadas,
+                'rejeicoes': rejeicoes,
+                'erros': erros,
+                'soma_segundos': soma_ns / 1e9,
+                'media_segundos': soma_ns / chamadas / 1e9 if chamadas else 0.0,
+                'maximo_segundos': maximo_ns / 1e9,
+                'p50_segundos': self._percentil(baldes, chamadas, maximo_ns, 0.50),
+                'p99_segundos': self._percentil(baldes, chamadas, maximo_ns, 0.99),
+                'baldes': dict(zip([*map(str, self.LIMITES_SEGUNDOS), '+Inf'], baldes)),
+            }
+        return resumo
+
+    def exposicao(self):
+        prefixo = self._prefixo
+        linhas = [
+            f'# TYPE {prefixo}_operacao_chamadas_total counter',
+            f'# TYPE {prefixo}_operacao_rejeicoes_total counter',
+            f'# TYPE {prefixo}_operacao_erros_total counter',
+            f'# TYPE {prefixo}_operacao_duracao_segundos histogram',
+        ]
+        for nome, dados in self.snapshot().items():
+            rotulo = f'operacao="{nome}"'
+            linhas.append(f'{prefixo}_operacao_chamadas_total{{{rotulo}}} {dados["chamadas"]}')
+            linhas.append(f'{prefixo}_operacao_rejeicoes_total{{{rotulo}}} {dados["rejeicoes"]}')
+            linhas.append(f'{prefixo}_operacao_erros_total{{{rotulo}}} {dados["erros"]}')
+            acumulado = 0
+            for limite, quantidade in dados['baldes'].items():
+                acumulado += quantidade
+                linhas.append(f'{prefixo}_operacao_duracao_segundos_bucket{{{rotulo},le="{limite}"}} {acumulado}')
+            linhas.append(f'{prefixo}_operacao_duracao_segundos_sum{{{rotulo}}} {dados["soma_segundos"]:.9f}')
+            linhas.append(f'{prefixo}_operacao_duracao_segundos_count{{{rotulo}}} {dados["chamadas"]}')
+        return '\n'.join(linhas) + '\n'
+
+    def zerar(self):
+        with self._trava:
+            self._estatisticas.clear()
+
+class MetricasNulas:
+    _contexto = nullcontext()
+
+    def etapa(self, nome):
+        return self._contexto
+
+    def snapshot(self):
+        return {}
+
+    def exposicao(self):
+        return ''
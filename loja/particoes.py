@@ -0,0 +1,437 @@
+import heapq
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import Future
+
+from .concorrencia import TravaLeituraEscrita
+from .dinheiro import Centavos, dividir_arredondando
+from .erros import ErroLoja, ErroOperacaoNegada, ErroValidacao
+from .interfaces import LojaInterface
+from .loja import Loja, validar_compras
+from .persistencia import decodificar_registro, ler_registros
+from .resultados import Resultado, SaidaConsole, SaidaNula
+from .vendas import RegistroVendas
+
+
+def particao_do_cpf(cpf, quantidade):
+    return zlib.crc32(str(cpf).encode('utf-8')) % quantidade
+
+def _executar_particao(conexao, diretorio, intervalo_snapshot):
+    loja = Loja(diretorio, intervalo_snapshot, saida=SaidaNula(), agenda_automatica=False)
+    try:
+        while True:
+            try:
+                pedido = conexao.recv()
+            except EOFError:
+                break
+            if pedido is None:
+                break
+            identificador, operacao, argumentos, nomeados = pedido
+            try:
+                resposta = (identificador, True, getattr(loja, operacao)(*argumentos, **nomeados))
+            except Exception as erro:
+                resposta = (identificador, False, erro)
+            try:
+                conexao.send(resposta)
+            except Exception as erro:
+                conexao.send((identificador, False, ErroLoja(f'Resposta de {operacao} não serializável: {erro!r}')))
+    finally:
+        loja.fechar()
+        conexao.close()
+
+class Particao:
+    def __init__(self, indice, diretorio=None, intervalo_snapshot=10000, contexto=None):
+        contexto = contexto or multiprocessing.get_context('spawn')
+        self._indice = indice
+        self._conexao, remota = contexto.Pipe()
+        self._processo = contexto.Process(target=_executar_particao, args=(remota, diretorio, intervalo_snapshot),
+                                          name=f'loja-particao-{indice}', daemon=True)
+        self._processo.start()
+        remota.close()
+        self._trava = threading.Lock()
+        self._pendentes = {}
+        self._proximo_id = 0
+        self._receptor = threading.Thread(target=self._receber, name=f'loja-particao-{indice}-receptor', daemon=True)
+        self._receptor.start()
+
+    @property
+    def indice(self):
+        return self._indice
+
+    def enviar(self, operacao, *argumentos, **nomeados):
+        futuro = Future()
+        with self._trava:
+            if self._conexao is None:
+                raise ErroOperacaoNegada(f'A partição {self._indice} está encerrada.')
+            self._proximo_id += 1
+            self._pendentes[self._proximo_id] = futuro
+            self._conexao.send((self._proximo_id, operacao, argumentos, nomeados))
+        return futuro
+
+    def chamar(self, operacao, *argumentos, **nomeados):
+        return self.enviar(operacao, *argumentos, **nomeados).result()
+
+    def _receber(self):
+        while True:
+            try:
+                identificador, ok, valor = self._conexao.recv()
+            except (EOFError, OSError):
+                break
+            futuro = self._pendentes.pop(identificador)
+            if ok:
+                futuro.set_result(valor)
+            else:
+                futuro.set_exception(valor)
+        with self._trava:
+            pendentes, self._pendentes = self._pendentes, {}
+        for futuro in pendentes.values():
+            futuro.set_exception(ErroOperacaoNegada(f'A partição {self._indice} foi encerrada.'))
+
+    def fechar(self):
+        with self._trava:
+            conexao, self._conexao = self._conexao, None
+            if conexao is None:
+                return
+            try:
+                conexao.send(None)
+            except OSError:
+                pass
+        self._processo.join()
+        conexao.close()
+        self._receptor.join()
+
+class LojaParticionada(LojaInterface):
+    def __init__(self, particoes=None, diretorio=None, intervalo_snapshot=10000, saida=None):
+        quantidade = particoes or os.cpu_count() or 1
+        self._saida = saida if saida is not None else SaidaConsole()
+        self._trava = TravaLeituraEscrita()
+        self._concorrente = True
+        self._rodizio = itertools.count()
+        self._particoes = []
+        self._proximo_evento_agenda = float('inf')
+        try:
+            for indice in range(quantidade):
+                caminho = os.path.join(diretorio, f'particao-{indice}') if diretorio else None
+                self._particoes.append(Particao(indice, caminho, intervalo_snapshot))
+            self._atualizar_proximo_evento()
+        except BaseException:
+            self.fechar()
+            raise
+
+    @property
+    def particoes(self):
+        return len(self._particoes)
+
+    @property
+    def saida(self):
+        return self._saida
+
+    @saida.setter
+    def saida(self, saida):
+        self._saida = saida
+
+    @property
+    def carregada(self):
+        return True
+
+    def carregar(self):
+        pass
+
+    def fechar(self):
+        for particao in self._particoes:
+            particao.fechar()
+
+    def _emitir(self, operacao, modelo, **dados):
+        resultado = Resultado(operacao, modelo, **dados)
+        self._saida.emitir(resultado)
+        return resultado
+
+    def _repassar(self, resultado):
+        if isinstance(resultado, Resultado):
+            self._saida.emitir(resultado)
+        return resultado
+
+    def _particao(self, cpf):
+        return self._particoes[particao_do_cpf(cpf, len(self._particoes))]
+
+    def _cliente(self, operacao, cpf, *argumentos):
+        with self._trava.leitura():
+            return self._repassar(self._particao(cpf).chamar(operacao, cpf, *argumentos))
+
+    def _consultar(self, operacao, *argumentos, **nomeados):
+        particao = self._particoes[next(self._rodizio) % len(self._particoes)]
+        with self._trava.leitura():
+            return particao.chamar(operacao, *argumentos, **nomeados)
+
+    def _todas(self, operacao, *argumentos, **nomeados):
+        futuros = [particao.enviar(operacao, *argumentos, **nomeados) for particao in self._particoes]
+        return [futuro.result() for futuro in futuros]
+
+    def _catalogo(self, operacao, *argumentos, **nomeados):
+        with self._trava.escrita():
+            primeira, *demais = self._particoes
+            resultado = primeira.chamar(operacao, *argumentos, **nomeados)
+            futuros = [particao.enviar(operacao, *argumentos, **nomeados) for particao in demais]
+            for futuro in futuros:
+                futuro.result()
+            return self._repassar(resultado)
+
+    def cadastrar_empresa(self, nome, cnpj):
+        return self._catalogo('cadastrar_empresa', nome, cnpj)
+
+    def excluir_empresa(self, cnpj):
+        return self._catalogo('excluir_empresa', cnpj)
+
+    def listar_empresa(self, offset=0, limite=None):
+        return self._consultar('listar_empresa', offset, limite)
+
+    def editar_empresa(self, cnpj, novo_nome=None):
+        return self._catalogo('editar_empresa', cnpj, novo_nome)
+
+    def cadastrar_produto(self, cnpj_empresa, nome_produto, preco, plataforma=None, categoria=None, tipo_promocao=None):
+        return self._catalogo('cadastrar_produto', cnpj_empresa, nome_produto, preco, plataforma, categoria, tipo_promocao)
+
+    def excluir_produto(self, cnpj_empresa, nome_produto):
+        with self._trava.escrita():
+            if any(self._todas('produto_foi_comprado', nome_produto)):
+                raise ErroOperacaoNegada('Não é possível excluir o produto, pois ele foi comprado por um cliente.')
+            return self._catalogo('excluir_produto', cnpj_empresa, nome_produto)
+
+    def listar_produto(self, offset=0, limite=None, plataforma=None, categoria=None, empresa=None, preco_min=None, preco_max=None):
+        return self._consultar('listar_produto', offset, limite, plataforma, categoria, empresa, preco_min, preco_max)
+
+    def editar_produto(self, cnpj_empresa, nome_produto, novo_nome=None, novo_preco=None, nova_plataforma=None, nova_categoria=None, nova_promocao=None):
+        return self._catalogo('editar_produto', cnpj_empresa, nome_produto, novo_nome, novo_preco,
+                              nova_plataforma, nova_categoria, nova_promocao)
+
+    def buscar_jogos(self, texto=None, trecho=None, plataforma=None, categoria=None, promocao=None, limite=50):
+        return self._consultar('listar_busca', texto, trecho, plataforma, categoria, promocao, limite)
+
+    def contar_facetas(self, texto=None, trecho=None, plataforma=None, categoria=None, promocao=None):
+        return self._consultar('contar_facetas', texto, trecho, plataforma, categoria, promocao)
+
+    def alterar_taxa_loja(self, taxa):
+        return self._catalogo('alterar_taxa_loja', taxa)
+
+    def importar_empresas(self, caminho, tamanho_lote=10000, max_erros=1000):
+        return self._catalogo('importar_empresas', caminho, tamanho_lote, max_erros)
+
+    def importar_produtos(self, caminho, tamanho_lote=10000, max_erros=1000):
+        return self._catalogo('importar_produtos', caminho, tamanho_lote, max_erros)
+
+    def definir_tipo_promocao(self, tipo_promocao, desconto):
+        return self._catalogo('definir_tipo_promocao', tipo_promocao, desconto)
+
+    def remover_tipo_promocao(self, tipo_promocao):
+        return self._catalogo('remover_tipo_promocao', tipo_promocao)
+
+    def aplicar_promocao_em_lote(self, tipo_promocao, empresa=None, categoria=None, plataforma=None):
+        return self._catalogo('aplicar_promocao_em_lote', tipo_promocao, empresa, categoria, plataforma)
+
+    def reverter_promocao_em_lote(self, empresa=None, categoria=None, plataforma=None, tipo_promocao=None):
+        return self._catalogo('reverter_promocao_em_lote', empresa, categoria, plataforma, tipo_promocao)
+
+    def _atualizar_proximo_evento(self):
+        agenda = self._particoes[0].chamar('listar_agenda')
+        self._proximo_evento_agenda = min(
+            (item['fim'] if item['ativa'] else item['inicio'] for item in agenda), default=float('inf'))
+
+    def agendar_promocao(self, tipo_promocao, inicio, fim, empresa=None, categoria=None, plataforma=None):
+        with self._trava.escrita():
+            resultado = self._catalogo('agendar_promocao', tipo_promocao, inicio, fim, empresa, categoria, plataforma)
+            self._todas('processar_agenda', time.time())
+            self._atualizar_proximo_evento()
+        return resultado
+
+    def cancelar_promocao_agendada(self, identificador):
+        with self._trava.escrita():
+            resultado = self._catalogo('cancelar_promocao_agendada', identificador)
+            self._atualizar_proximo_evento()
+        return resultado
+
+    def processar_agenda(self, agora=None):
+        agora = time.time() if agora is None else agora
+        with self._trava.escrita():
+            resultado = self._catalogo('processar_agenda', agora)
+            self._atualizar_proximo_evento()
+        return resultado
+
+    def listar_agenda(self):
+        return self._consultar('listar_agenda')
+
+    def verificar_agenda(self):
+        if time.time() >= self._proximo_evento_agenda:
+            self.processar_agenda()
+
+    def cadastrar_cliente(self, nome, cpf, idade):
+        with self._trava.leitura():
+            return self._repassar(self._particao(cpf).chamar('cadastrar_cliente', nome, cpf, idade))
+
+    def importar_clientes(self, caminho, tamanho_lote=10000, max_erros=1000):
+        quantidade = len(self._particoes)
+        resumo = {'aceitos': 0, 'rejeitados': 0, 'erros': []}
+        with self._trava.leitura():
+            for lote in ler_registros(caminho, tamanho_lote):
+                registros = [[] for _ in range(quantidade)]
+                for linha, registro in lote:
+                    try:
+                        registro = decodificar_registro(registro)
+                        indice = particao_do_cpf(registro['cpf'], quantidade)
+                    except (KeyError, TypeError, ValueError) as excecao:
+                        resumo['rejeitados'] += 1
+                        resumo['erros'].append((linha, f'Registro inválido: {excecao!r}'))
+                        continue
+                    registros[indice].append((linha, registro))
+                futuros = [particao.enviar('importar_registros_clientes', registros[particao.indice], max_erros)
+                           for particao in self._particoes if registros[particao.indice]]
+                for futuro in futuros:
+                    parcial = futuro.result()
+                    resumo['aceitos'] += parcial['aceitos']
+                    resumo['rejeitados'] += parcial['rejeitados']
+                    resumo['erros'].extend(parcial['erros'])
+                resumo['erros'] = sorted(resumo['erros'])[:max_erros]
+        return resumo
+
+    def excluir_cliente(self, cpf):
+        return self._cliente('excluir_cliente', cpf)
+
+    def listar_cliente(self, offset=0, limite=None):
+        fim = None if limite is None else offset + limite
+        with self._trava.leitura():
+            paginas = self._todas('listar_cliente', 0, fim)
+        return [cliente for pagina in paginas for cliente in pagina][offset:fim]
+
+    def editar_cliente(self, cpf, novo_nome=None, nova_idade=None):
+        return self._cliente('editar_cliente', cpf, novo_nome, nova_idade)
+
+    def adicionar_saldo(self, cpf_cliente, valor):
+        return self._cliente('adicionar_saldo', cpf_cliente, valor)
+
+    def remover_saldo(self, cpf_cliente, valor):
+        return self._cliente('remover_saldo', cpf_cliente, valor)
+
+    def remover_jogo_cliente(self, cpf_cliente, nome_jogo):
+        return self._cliente('remover_jogo_cliente', cpf_cliente, nome_jogo)
+
+    def comprar_jogo(self, cpf_cliente, nome_produto):
+        self.verificar_agenda()
+        return self._cliente('comprar_jogo', cpf_cliente, nome_produto)
+
+    def comprar_jogos_em_lote(self, compras):
+        compras = validar_compras(compras)
+        self.verificar_agenda()
+        quantidade = len(self._particoes)
+        lotes = [[] for _ in range(quantidade)]
+        posicoes = [[] for _ in range(quantidade)]
+        for posicao, (cpf_cliente, nome_produto) in enumerate(compras):
+            indice = particao_do_cpf(cpf_cliente, quantidade)
+            lotes[indice].append((cpf_cliente, nome_produto))
+            posicoes[indice].append(posicao)
+        with self._trava.leitura():
+            futuros = [(particao.enviar('comprar_jogos_em_lote', lote), posicoes[particao.indice])
+                       for particao, lote in zip(self._particoes, lotes) if lote]
+            resultados = [None] * len(compras)
+            for futuro, indices in futuros:
+                for posicao, resultado in zip(indices, futuro.result()):
+                    resultados[posicao] = resultado
+        return resultados
+
+    def historico_cliente(self, cpf_cliente):
+        with self._trava.leitura():
+            return self._particao(cpf_cliente).chamar('historico_cliente', cpf_cliente)
+
+    def exibir_historico_cliente(self, cpf_cliente):
+        return self._cliente('exibir_historico_cliente', cpf_cliente)
+
+    def exibir_jogos_comprados(self, cpf_cliente):
+        return self._cliente('exibir_jogos_comprados', cpf_cliente)
+
+    def relatorio_financeiro(self, por=None):
+        with self._trava.leitura():
+            parciais = self._todas('relatorio_financeiro', por)
+        if por is None:
+            return self._somar_totais(parciais)
+        return self._combinar_relatorios(parciais)
+
+    def _somar_totais(self, parciais):
+        return {chave: sum(parcial[chave] for parcial in parciais) if chave == 'quantidade'
+                else Centavos(sum(parcial[chave] for parcial in parciais))
+                for chave in ('receita', 'lucro', 'quantidade')}
+
+    def relatorio_periodo(self, inicio=None, fim=None, por=None):
+        with self._trava.leitura():
+            parciais = self._todas('relatorio_periodo', inicio, fim, por)
+        if por is None:
+            return self._somar_totais(parciais)
+        return self._combinar_relatorios(parciais)
+
+    def serie_vendas(self, granularidade='hora', inicio=None, fim=None):
+        with self._trava.leitura():
+            parciais = self._todas('serie_vendas', granularidade, inicio, fim)
+        baldes = {}
+        for balde in heapq.merge(*parciais, key=lambda balde: balde['inicio']):
+            total = baldes.setdefault(balde['inicio'], {'inicio': balde['inicio'], 'quantidade': 0, 'receita': 0, 'lucro': 0})
+            for chave in ('quantidade', 'receita', 'lucro'):
+                total[chave] += balde[chave]
+        for total in baldes.values():
+            total['receita'] = Centavos(total['receita'])
+            total['lucro'] = Centavos(total['lucro'])
+        return list(baldes.values())
+
+    def vendas_entre(self, inicio=None, fim=None, limite=None):
+        with self._trava.leitura():
+            parciais = self._todas('vendas_entre', inicio, fim, limite)
+        return list(itertools.islice(heapq.merge(*parciais, key=lambda venda: venda[0]), limite))
+
+    def _combinar_relatorios(self, parciais):
+        relatorio = {}
+        for parcial in parciais:
+            for valor, linha in parcial.items():
+                total = relatorio.setdefault(valor, {'receita': 0, 'lucro': 0, 'quantidade': 0})
+                for chave in ('receita', 'lucro', 'quantidade'):
+                    total[chave] += linha[chave]
+        for total in relatorio.values():
+            total['receita'] = Centavos(total['receita'])
+            total['lucro'] = Centavos(total['lucro'])
+            total['ticket_medio'] = Centavos(dividir_arredondando(total['receita'], total['quantidade']))
+        return relatorio
+
+    def mais_vendidos(self, limite=10, por='produto', criterio='quantidade', inicio=None, fim=None):
+        if criterio not in RegistroVendas.CRITERIOS:
+            raise ErroValidacao(f'Critério de classificação inválido: {criterio}')
+        if not isinstance(limite, int) or limite < 1:
+            raise ErroValidacao('O limite deve ser um inteiro positivo.')
+        with self._trava.leitura():
+            if por == 'cliente':
+                parciais = self._todas('mais_vendidos', limite, por, criterio, inicio, fim)
+            elif inicio is not None or fim is not None:
+                parciais = self._todas('relatorio_periodo', inicio, fim, por)
+            else:
+                parciais = self._todas('relatorio_financeiro', por)
+        relatorio = self._combinar_relatorios(parciais)
+        return {valor: relatorio[valor] for valor in heapq.nlargest(limite, relatorio, key=lambda valor: relatorio[valor][criterio])}
+
+    def exibir_relatorio_financeiro(self):
+        with self._trava.leitura():
+            parciais = self._todas('exibir_relatorio_financeiro')
+        receita = Centavos(sum(parcial.dados['receita'] for parcial in parciais))
+        lucro = Centavos(sum(parcial.dados['lucro'] for parcial in parciais))
+        return self._emitir('exibir_relatorio_financeiro', '\nRelatório Financeiro:\nReceita Total: R${receita:.2f}\nLucro Total: R${lucro:.2f}',
+                            receita=receita, lucro=lucro)
+
+    def salvar_snapshot(self):
+        with self._trava.escrita():
+            self._todas('salvar_snapshot')
+
+    def snapshot_metricas(self):
+        raise ErroOperacaoNegada('Métricas não estão disponíveis na loja particionada.')
+
+    def exposicao_metricas(self):
+        raise ErroOperacaoNegada('Métricas não estão disponíveis na loja particionada.')
+
+    def executar(self):
+        raise ErroOperacaoNegada('A loja particionada não tem menu interativo; use o modo servidor.')
@@ -0,0 +1,87 @@
+import csv
+import json
+import os
+import threading
+from itertools import islice
+
+
+def ler_registros(caminho, tamanho_lote=10000):
+    with open(caminho, newline='', encoding='utf-8') as arquivo:
+        if caminho.endswith('.csv'):
+            leitor = csv.reader(arquivo)
+            cabecalho = next(leitor, [])
+            linhas = ((leitor.line_num, dict(zip(cabecalho, linha))) for linha in leitor if linha)
+        else:
+            linhas = ((numero, linha) for numero, linha in enumerate(arquivo, 1) if linha.strip())
+        while True:
+            lote = list(islice(linhas, tamanho_lote))
+            if not lote:
+                break
+            yield lote
+
+def decodificar_registro(registro):
+    return json.loads(registro) if isinstance(registro, str) else registro
+
+class Diario:
+    def __init__(self, caminho, seq_inicial=0):
+        self._caminho = caminho
+        self._arquivo = open(caminho, 'a', encoding='utf-8')
+        self._trava = threading.Lock()
+        self._trava_sincronia = threading.Lock()
+        self._seq = seq_inicial
+        self._seq_sincronizado = seq_inicial
+
+    @property
+    def seq(self):
+        return self._seq
+
+    def ler(self, desde_seq=0):
+        valido = 0
+        with open(self._caminho, 'rb') as arquivo:
+            for linha in arquivo:
+                if not linha.endswith(b'\n'):
+                    break
+                try:
+                    registro = json.loads(linha)
+                except ValueError:
+                    break
+                valido += len(linha)
+                if registro['seq'] > desde_seq:
+                    self._seq = max(self._seq, registro['seq'])
+                    yield registro
+        if valido < os.path.getsize(self._caminho):
+            os.truncate(self._caminho, valido)
+        self._seq_sincronizado = self._seq
+
+    def registrar(self, operacao, argumentos):
+        with self._trava:
+            self._seq += 1
+            linha = json.dumps({'seq': self._seq, 'op': operacao, 'args': argumentos}, ensure_ascii=False)
+            self._arquivo.write(linha + '\n')
+            return self._seq
+
+    def confirmar(self, seq=None):
+        if seq is None:
+            seq = self._seq
+        if seq <= self._seq_sincronizado:
+            return
+        with self._trava_sincronia:
+            if seq <= self._seq_sincronizado:
+                return
+            with self._trava:
+                self._arquivo.flush()
+                escrito = self._seq
+            os.fsync(self._arquivo.fileno())
+            self._seq_sincronizado = escrito
+
+    def reiniciar(self, seq):
+        with self._trava_sincronia, self._trava:
+            self._arquivo.close()
+            self._arquivo = open(self._caminho, 'w', encoding='utf-8')
+            os.fsync(self._arquivo.fileno())
+            self._seq = max(self._seq, seq)
+            self._seq_sincronizado = self._seq
+
+    def fechar(self):
+        self.confirmar()
+        self._arquivo.close()
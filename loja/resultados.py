@@ -0,0 +1,70 @@
+from abc import ABC, abstractmethod
+from collections import deque
+
+
+class Resultado:
+    __slots__ = ('operacao', 'dados', '_modelo')
+
+    def __init__(self, operacao, modelo, **dados):
+        self.operacao = operacao
+        self.dados = dados
+        self._modelo = modelo
+
+    @property
+    def mensagem(self):
+        if callable(self._modelo):
+            return self._modelo(**self.dados)
+        return self._modelo.format(**self.dados)
+
+    def __str__(self):
+        return self.mensagem
+
+    def __repr__(self):
+        return f'Resultado({self.operacao!r}, {self.dados!r})'
+
+class SaidaEventos(ABC):
+    @abstractmethod
+    def emitir(self, evento):
+        pass
+
+class SaidaConsole(SaidaEventos):
+    def emitir(self, evento):
+        print(evento)
+
+class SaidaBuffer(SaidaEventos):
+    def __init__(self, capacidade=None):
+        self._eventos = deque(maxlen=capacidade)
+
+    def emitir(self, evento):
+        self._eventos.append(evento)
+
+    @property
+    def eventos(self):
+        return list(self._eventos)
+
+    def mensagens(self):
+        return [str(evento) for evento in self._eventos]
+
+    def descarregar(self, destino=None):
+        eventos = list(self._eventos)
+        self._eventos.clear()
+        if destino is not None:
+            for evento in eventos:
+                destino.emitir(evento)
+        return eventos
+
+class SaidaNula(SaidaEventos):
+    def emitir(self, evento):
+        pass
+
+def formatar_historico(cliente, compras):
+    if not compras:
+        return f'Nenhuma compra registrada para o cliente {cliente}.'
+    linhas = [f'Histórico de Compras do Cliente {cliente}:']
+    linhas.extend(f'Produto: {nome_produto}, Valor: R${preco_final:.2f}, Ação: Comprado' for nome_produto, preco_final in compras)
+    return '\n'.join(linhas)
+
+def formatar_jogos_comprados(cliente, jogos):
+    if not jogos:
+        return f'O cliente {cliente} ainda não comprou nenhum jogo.'
+    return '\n'.join([f'Jogos comprados por {cliente}:', *jogos])
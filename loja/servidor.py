@@ -0,0 +1,165 @@
+import asyncio
+import json
+import socket
+
+from .dinheiro import Centavos
+from .erros import ErroLoja
+from .resultados import Resultado
+
+
+def para_json(valor):
+    if isinstance(valor, Centavos):
+        return str(valor)
+    if isinstance(valor, dict):
+        return {chave: para_json(item) for chave, item in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [para_json(item) for item in valor]
+    return valor
+
+class ServidorLoja:
+    OPERACOES = frozenset({
+        'cadastrar_empresa', 'excluir_empresa', 'listar_empresa', 'editar_empresa',
+        'cadastrar_cliente', 'excluir_cliente', 'listar_cliente', 'editar_cliente',
+        'cadastrar_produto', 'excluir_produto', 'listar_produto', 'editar_produto',
+        'comprar_jogo', 'comprar_jogos_em_lote', 'exibir_historico_cliente', 'exibir_jogos_comprados',
+        'exibir_relatorio_financeiro', 'adicionar_saldo', 'remover_saldo', 'remover_jogo_cliente',
+        'alterar_taxa_loja', 'buscar_jogos', 'contar_facetas', 'historico_cliente', 'relatorio_financeiro',
+        'snapshot_metricas', 'exposicao_metricas',
+        'definir_tipo_promocao', 'remover_tipo_promocao', 'aplicar_promocao_em_lote', 'reverter_promocao_em_lote',
+        'agendar_promocao', 'cancelar_promocao_agendada', 'processar_agenda', 'listar_agenda', 'mais_vendidos',
+        'vendas_entre', 'relatorio_periodo', 'serie_vendas',
+    })
+
+    def __init__(self, loja, host='127.0.0.1', porta=8765, max_pendentes=64, intervalo_agenda=1.0):
+        self._loja = loja
+        self._intervalo_agenda = intervalo_agenda
+        self._vigia_agenda = None
+        self._host = host
+        self._porta = porta
+        self._max_pendentes = max_pendentes
+        self._servidor = None
+
+    @property
+    def porta(self):
+        return self._servidor.sockets[0].getsockname()[1] if self._servidor else self._porta
+
+    async def iniciar(self):
+        self._servidor = await asyncio.start_server(self._atender, self._host, self._porta)
+        if not self._loja.carregada:
+            asyncio.get_running_loop().run_in_executor(None, self._loja.carregar)
+        self._vigia_agenda = asyncio.create_task(self._vigiar_agenda())
+        return self._servidor
+
+    async def _vigiar_agenda(self):
+        laco = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self._intervalo_agenda)
+            if self._loja._concorrente:
+                await laco.run_in_executor(None, self._loja.verificar_agenda)
+            else:
+                self._loja.verificar_agenda()
+
+    async def parar(self):
+        if self._vigia_agenda is not None:
+            self._vigia_agenda.cancel()
+            self._vigia_agenda = None
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+
+    async def servir_para_sempre(self):
+        if self._servidor is None:
+            await self.iniciar()
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    def _executar(self, pedido):
+        operacao = pedido.get('op')
+        if operacao not in self.OPERACOES:
+            return {'ok': False, 'erro': 'operacao_invalida', 'mensagem': f'Operação desconhecida: {operacao}'}
+        argumentos = pedido.get('args') or []
+        nomeados = pedido.get('kwargs') or {}
+        if isinstance(argumentos, dict):
+            argumentos, nomeados = [], argumentos
+        try:
+            resultado = getattr(self._loja, operacao)(*argumentos, **nomeados)
+        except ErroLoja as erro:
+            return {'ok': False, 'erro': erro.codigo, 'mensagem': str(erro)}
+        except TypeError as erro:
+            return {'ok': False, 'erro': 'argumentos_invalidos', 'mensagem': str(erro)}
+        except Exception as erro:
+            return {'ok': False, 'erro': 'erro_interno', 'mensagem': repr(erro)}
+        if isinstance(resultado, Resultado):
+            return {'ok': True, 'resultado': para_json(resultado.dados), 'mensagem': resultado.mensagem}
+        return {'ok': True, 'resultado': para_json(resultado)}
+
+    async def _processar(self, linha):
+        try:
+            pedido = json.loads(linha)
+            if not isinstance(pedido, dict):
+                raise ValueError('o pedido deve ser um objeto JSON')
+        except ValueError as erro:
+            return {'id': None, 'ok': False, 'erro': 'json_invalido', 'mensagem': str(erro)}
+        if self._loja._concorrente:
+            resposta = await asyncio.get_running_loop().run_in_executor(None, self._executar, pedido)
+        else:
+            resposta = self._executar(pedido)
+        resposta['id'] = pedido.get('id')
+        return resposta
+
+    async def _atender(self, leitor, escritor):
+        pendentes = asyncio.Queue(self._max_pendentes)
+
+        async def responder():
+            while True:
+                tarefa = await pendentes.get()
+                if tarefa is None:
+                    break
+                resposta = await tarefa
+                escritor.write(json.dumps(resposta, ensure_ascii=False, default=str).encode('utf-8') + b'\n')
+                await escritor.drain()
+
+        respondedor = asyncio.create_task(responder())
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                if linha.strip():
+                    await pendentes.put(asyncio.create_task(self._processar(linha)))
+        except ConnectionError:
+            pass
+        finally:
+            await pendentes.put(None)
+            try:
+                await respondedor
+            except ConnectionError:
+                pass
+            escritor.close()
+
+class ClienteLoja:
+    def __init__(self, host='127.0.0.1', porta=8765):
+        self._conexao = socket.create_connection((host, porta))
+        self._leitor = self._conexao.makefile('rb')
+        self._proximo_id = 0
+
+    def enviar(self, operacao, *argumentos, **nomeados):
+        self._proximo_id += 1
+        pedido = {'id': self._proximo_id, 'op': operacao, 'args': list(argumentos), 'kwargs': nomeados}
+        self._conexao.sendall(json.dumps(pedido, ensure_ascii=False).encode('utf-8') + b'\n')
+        return self._proximo_id
+
+    def receber(self):
+        linha = self._leitor.readline()
+        if not linha:
+            raise ConnectionError('Conexão encerrada pelo servidor.')
+        return json.loads(linha)
+
+    def chamar(self, operacao, *argumentos, **nomeados):
+        self.enviar(operacao, *argumentos, **nomeados)
+        return self.receber()
+
+    def fechar(self):
+        self._leitor.close()
+        self._conexao.close()
@@ -0,0 +1,389 @@
+import heapq
+import math
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from .dinheiro import Centavos, dividir_arredondando
+
+
+class _Balde:
+    __slots__ = ('contagem', 'membros', 'abaixo', 'acima')
+
+    def __init__(self, contagem, abaixo=None, acima=None):
+        self.contagem = contagem
+        self.membros = {}
+        self.abaixo = abaixo
+        self.acima = acima
+
+class RankingUnidades:
+    def __init__(self):
+        self._baldes = {}
+        self._base = None
+        self._topo = None
+
+    def __len__(self):
+        return len(self._baldes)
+
+    def contagem(self, codigo):
+        balde = self._baldes.get(codigo)
+        return balde.contagem if balde else 0
+
+    def _inserir_balde(self, contagem, abaixo):
+        acima = abaixo.acima if abaixo else self._base
+        balde = _Balde(contagem, abaixo, acima)
+        if abaixo:
+            abaixo.acima = balde
+        else:
+            self._base = balde
+        if acima:
+            acima.abaixo = balde
+        else:
+            self._topo = balde
+        return balde
+
+    def _remover_balde(self, balde):
+        if balde.abaixo:
+            balde.abaixo.acima = balde.acima
+        else:
+            self._base = balde.acima
+        if balde.acima:
+            balde.acima.abaixo = balde.abaixo
+        else:
+            self._topo = balde.abaixo
+
+    def incrementar(self, codigo):
+        atual = self._baldes.get(codigo)
+        contagem = atual.contagem + 1 if atual else 1
+        destino = atual.acima if atual else self._base
+        if destino is None or destino.contagem != contagem:
+            destino = self._inserir_balde(contagem, atual)
+        destino.membros[codigo] = None
+        self._baldes[codigo] = destino
+        if atual:
+            del atual.membros[codigo]
+            if not atual.membros:
+                self._remover_balde(atual)
+
+    def maiores(self, k):
+        ranking = []
+        balde = self._topo
+        while balde and len(ranking) < k:
+            faltam = k - len(ranking)
+            membros = sorted(balde.membros) if len(balde.membros) <= faltam else heapq.nsmallest(faltam, balde.membros)
+            ranking.extend((codigo, balde.contagem) for codigo in membros)
+            balde = balde.abaixo
+        return ranking
+
+    @classmethod
+    def de_contagens(cls, contagens):
+        ranking = cls()
+        abaixo = None
+        for codigo in sorted((codigo for codigo, contagem in enumerate(contagens) if contagem),
+                             key=contagens.__getitem__):
+            if abaixo is None or abaixo.contagem != contagens[codigo]:
+                abaixo = ranking._inserir_balde(contagens[codigo], abaixo)
+            abaixo.membros[codigo] = None
+            ranking._baldes[codigo] = abaixo
+        return ranking
+
+class SerieTemporal:
+    def __init__(self, largura):
+        self.largura = largura
+        self.inicios = array('q')
+        self.quantidades = array('q')
+        self.receitas = array('q')
+        self.lucros = array('q')
+        self._inicio = None
+        self._fim = -math.inf
+        self._quantidade = self._receita = self._lucro = 0
+
+    def __len__(self):
+        return len(self.inicios) + (self._inicio is not None)
+
+    def acumular(self, instante, receita, lucro):
+        if instante < self._fim:
+            self._quantidade += 1
+            self._receita += receita
+            self._lucro += lucro
+        else:
+            self._abrir(math.floor(instante / self.largura) * self.largura, 1, receita, lucro)
+
+    def _abrir(self, inicio, quantidade, receita, lucro):
+        if self._inicio is not None:
+            self.inicios.append(self._inicio)
+            self.quantidades.append(self._quantidade)
+            self.receitas.append(self._receita)
+            self.lucros.append(self._lucro)
+        self._inicio, self._fim = inicio, inicio + self.largura
+        self._quantidade, self._receita, self._lucro = quantidade, receita, lucro
+
+    def somar(self, inicio, fim):
+        primeiro, ultimo = bisect_left(self.inicios, inicio), bisect_left(self.inicios, fim)
+        quantidade = sum(self.quantidades[primeiro:ultimo])
+        receita = sum(self.receitas[primeiro:ultimo])
+        lucro = sum(self.lucros[primeiro:ultimo])
+        if self._inicio is not None and inicio <= self._inicio < fim:
+            quantidade, receita, lucro = quantidade + self._quantidade, receita + self._receita, lucro + self._lucro
+        return quantidade, receita, lucro
+
+    def baldes(self, inicio=None, fim=None):
+        primeiro = 0 if inicio is None else bisect_left(self.inicios, math.floor(inicio / self.largura) * self.largura)
+        ultimo = len(self.inicios) if fim is None else bisect_left(self.inicios, math.ceil(fim))
+        baldes = [(self.inicios[posicao], self.quantidades[posicao], self.receitas[posicao], self.lucros[posicao])
+                  for posicao in range(primeiro, ultimo)]
+        if (self._inicio is not None and (inicio is None or self._fim > inicio)
+                and (fim is None or self._inicio < fim)):
+            baldes.append((self._inicio, self._quantidade, self._receita, self._lucro))
+        return [{'inicio': balde_inicio, 'quantidade': quantidade, 'receita': Centavos(receita), 'lucro': Centavos(lucro)}
+                for balde_inicio, quantidade, receita, lucro in baldes]
+
+    def exportar(self):
+        dados = {'inicios': self.inicios.tolist(), 'quantidades': self.quantidades.tolist(),
+                 'receitas': self.receitas.tolist(), 'lucros': self.lucros.tolist()}
+        if self._inicio is not None:
+            for nome, valor in zip(dados, (self._inicio, self._quantidade, self._receita, self._lucro)):
+                dados[nome].append(valor)
+        return dados
+
+    @classmethod
+    def importar(cls, largura, dados):
+        serie = cls(largura)
+        for nome in ('inicios', 'quantidades', 'receitas', 'lucros'):
+            setattr(serie, nome, array('q', dados[nome]))
+        if serie.inicios:
+            serie._abrir(serie.inicios.pop(), serie.quantidades.pop(), serie.receitas.pop(), serie.lucros.pop())
+        return serie
+
+class RegistroVendas:
+    DIMENSOES = ('cliente', 'nome_cliente', 'produto', 'empresa', 'categoria', 'plataforma', 'promocao')
+    CRITERIOS = ('quantidade', 'receita', 'lucro')
+    GRANULARIDADES = {'dia': 86400, 'hora': 3600, 'minuto': 60}
+
+    def __init__(self):
+        self._valores = {dimensao: [] for dimensao in self.DIMENSOES}
+        self._codigos = {dimensao: {} for dimensao in self.DIMENSOES}
+        self._colunas = {dimensao: array('l') for dimensao in self.DIMENSOES}
+        self._receita = array('q')
+        self._lucro = array('q')
+        self._instantes = array('d')
+        self._series = {nome: SerieTemporal(largura) for nome, largura in self.GRANULARIDADES.items()}
+        self._agregados = {dimensao: {criterio: [] for criterio in self.CRITERIOS} for dimensao in self.DIMENSOES}
+        self._receita_total = 0
+        self._lucro_total = 0
+        self._ranking_produtos = RankingUnidades()
+        self._preparar_acumuladores()
+
+    def _preparar_acumuladores(self):
+        self._acumuladores = [(dimensao, self._codigos[dimensao], self._colunas[dimensao],
+                               self._agregados[dimensao]['quantidade'], self._agregados[dimensao]['receita'],
+                               self._agregados[dimensao]['lucro'])
+                              for dimensao in self.DIMENSOES]
+        self._coluna_produtos = self._colunas['produto']
+        self._acumular_series = tuple(serie.acumular for serie in self._series.values())
+
+    def __len__(self):
+        return len(self._receita)
+
+    def _codificar(self, dimensao, valor):
+        codigos = self._codigos[dimensao]
+        codigo = codigos.get(valor)
+        if codigo is None:
+            codigo = codigos[valor] = len(self._valores[dimensao])
+            self._valores[dimensao].append(valor)
+            for acumulado in self._agregados[dimensao].values():
+                acumulado.append(0)
+        return codigo
+
+    def registrar(self, receita, lucro, instante=None, **dimensoes):
+        if instante is None:
+            instante = time.time()
+        if self._instantes and instante < self._instantes[-1]:
+            instante = self._instantes[-1]
+        for dimensao, codigos, coluna, quantidades, receitas, lucros in self._acumuladores:
+            valor = dimensoes.get(dimensao)
+            codigo = codigos.get(valor)
+            if codigo is None:
+                codigo = self._codificar(dimensao, valor)
+            coluna.append(codigo)
+            quantidades[codigo] += 1
+            receitas[codigo] += receita
+            lucros[codigo] += lucro
+        self._ranking_produtos.incrementar(self._coluna_produtos[-1])
+        self._receita.append(receita)
+        self._lucro.append(lucro)
+        self._receita_total += receita
+        self._lucro_total += lucro
+        self._instantes.append(instante)
+        for acumular in self._acumular_series:
+            acumular(instante, receita, lucro)
+        return len(self._receita) - 1
+
+    @property
+    def ultimo_instante(self):
+        return self._instantes[-1] if self._instantes else None
+
+    def instante(self, indice):
+        return self._instantes[indice]
+
+    def valor(self, dimensao, indice):
+        return self._valores[dimensao][self._colunas[dimensao][indice]]
+
+    def linha(self, indice):
+        return (self.valor('cliente', indice), self.valor('nome_cliente', indice),
+                self.valor('produto', indice), Centavos(self._receita[indice]))
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield self.linha(indice)
+
+    def totais(self):
+        return {'receita': Centavos(self._receita_total), 'lucro': Centavos(self._lucro_total), 'quantidade': len(self)}
+
+    def intervalo(self, inicio=None, fim=None):
+        primeiro = 0 if inicio is None else bisect_left(self._instantes, inicio)
+        ultimo = len(self) if fim is None else bisect_left(self._instantes, fim)
+        return primeiro, max(primeiro, ultimo)
+
+    def vendas_entre(self, inicio=None, fim=None, limite=None):
+        primeiro, ultimo = self.intervalo(inicio, fim)
+        if limite is not None:
+            ultimo = min(ultimo, primeiro + limite)
+        return [(self._instantes[indice],) + self.linha(indice) for indice in range(primeiro, ultimo)]
+
+    def _somar_periodo(self, inicio, fim, nivel):
+        if inicio >= fim:
+            return 0, 0, 0
+        if nivel == len(self._series):
+            primeiro, ultimo = self.intervalo(inicio, fim)
+            return ultimo - primeiro, sum(self._receita[primeiro:ultimo]), sum(self._lucro[primeiro:ultimo])
+        serie = list(self._series.values())[nivel]
+        primeiro = math.ceil(inicio / serie.largura) * serie.largura
+        ultimo = math.floor(fim / serie.largura) * serie.largura
+        if primeiro >= ultimo:
+            return self._somar_periodo(inicio, fim, nivel + 1)
+        partes = (serie.somar(primeiro, ultimo), self._somar_periodo(inicio, primeiro, nivel + 1),
+                  self._somar_periodo(ultimo, fim, nivel + 1))
+        return tuple(map(sum, zip(*partes)))
+
+    def totais_entre(self, inicio=None, fim=None):
+        primeiro, ultimo = self.intervalo(inicio, fim)
+        if primeiro == 0 and ultimo == len(self):
+            return self.totais()
+        if primeiro == ultimo:
+            return {'receita': Centavos(0), 'lucro': Centavos(0), 'quantidade': 0}
+        quantidade, receita, lucro = self._somar_periodo(self._instantes[primeiro],
+                                                         math.nextafter(self._instantes[ultimo - 1], math.inf), 0)
+        return {'receita': Centavos(receita), 'lucro': Centavos(lucro), 'quantidade': quantidade}
+
+    def serie(self, granularidade='hora', inicio=None, fim=None):
+        return self._series[granularidade].baldes(inicio, fim)
+
+    def _linha_agregada(self, dimensao, codigo):
+        agregado = self._agregados[dimensao]
+        quantidade, receita = agregado['quantidade'][codigo], agregado['receita'][codigo]
+        return {
+            'receita': Centavos(receita),
+            'lucro': Centavos(agregado['lucro'][codigo]),
+            'quantidade': quantidade,
+            'ticket_medio': Centavos(dividir_arredondando(receita, quantidade)),
+        }
+
+    def agrupar(self, por):
+        quantidades = self._agregados[por]['quantidade']
+        return {valor: self._linha_agregada(por, codigo)
+                for codigo, valor in enumerate(self._valores[por]) if quantidades[codigo]}
+
+    def _acumular_periodo(self, por, inicio, fim):
+        primeiro, ultimo = self.intervalo(inicio, fim)
+        coluna = self._colunas[por][primeiro:ultimo]
+        acumulado = {'quantidade': Counter(coluna), 'receita': Counter(), 'lucro': Counter()}
+        receitas, lucros = acumulado['receita'], acumulado['lucro']
+        for codigo, receita, lucro in zip(coluna, self._receita[primeiro:ultimo], self._lucro[primeiro:ultimo]):
+            receitas[codigo] += receita
+            lucros[codigo] += lucro
+        return acumulado
+
+    def _linha_periodo(self, acumulado, codigo):
+        quantidade, receita = acumulado['quantidade'][codigo], acumulado['receita'][codigo]
+        return {
+            'receita': Centavos(receita),
+            'lucro': Centavos(acumulado['lucro'][codigo]),
+            'quantidade': quantidade,
+            'ticket_medio': Centavos(dividir_arredondando(receita, quantidade)),
+        }
+
+    def agrupar_periodo(self, por, inicio=None, fim=None):
+        acumulado = self._acumular_periodo(por, inicio, fim)
+        valores = self._valores[por]
+        return {valores[codigo]: self._linha_periodo(acumulado, codigo) for codigo in sorted(acumulado['quantidade'])}
+
+    def _mais_vendidos_no_periodo(self, limite, por, criterio, inicio, fim):
+        acumulado = self._acumular_periodo(por, inicio, fim)
+        valores, chave = self._valores[por], acumulado[criterio]
+        codigos = heapq.nlargest(limite, acumulado['quantidade'], key=lambda codigo: (chave[codigo], -codigo))
+        return {valores[codigo]: self._linha_periodo(acumulado, codigo) for codigo in codigos}
+
+    def mais_vendidos(self, limite=10, por='produto', criterio='quantidade', inicio=None, fim=None):
+        if inicio is not None or fim is not None:
+            return self._mais_vendidos_no_periodo(limite, por, criterio, inicio, fim)
+        if por == 'produto' and criterio == 'quantidade':
+            codigos = [codigo for codigo, _ in self._ranking_produtos.maiores(limite)]
+        else:
+            acumulado = self._agregados[por][criterio]
+            quantidades = self._agregados[por]['quantidade']
+            codigos = heapq.nlargest(limite, (codigo for codigo in range(len(acumulado)) if quantidades[codigo]),
+                                     key=lambda codigo: (acumulado[codigo], -codigo))
+        valores = self._valores[por]
+        return {valores[codigo]: self._linha_agregada(por, codigo) for codigo in codigos}
+
+    def _recalcular_agregados(self):
+        for dimensao in self.DIMENSOES:
+            grupos = len(self._valores[dimensao])
+            quantidades, receitas, lucros = [0] * grupos, [0] * grupos, [0] * grupos
+            for codigo, receita, lucro in zip(self._colunas[dimensao], self._receita, self._lucro):
+                quantidades[codigo] += 1
+                receitas[codigo] += receita
+                lucros[codigo] += lucro
+            self._agregados[dimensao] = {'quantidade': quantidades, 'receita': receitas, 'lucro': lucros}
+        self._preparar_acumuladores()
+
+    def exportar(self):
+        return {
+            'valores': self._valores,
+            'colunas': {dimensao: coluna.tolist() for dimensao, coluna in self._colunas.items()},
+            'receita': self._receita.tolist(),
+            'lucro': self._lucro.tolist(),
+            'instantes': self._instantes.tolist(),
+            'agregados': self._agregados,
+            'series': {nome: serie.exportar() for nome, serie in self._series.items()},
+        }
+
+    @classmethod
+    def importar(cls, dados):
+        vendas = cls()
+        for dimensao in cls.DIMENSOES:
+            vendas._valores[dimensao] = list(dados['valores'][dimensao])
+            vendas._codigos[dimensao] = {valor: codigo for codigo, valor in enumerate(vendas._valores[dimensao])}
+            vendas._colunas[dimensao] = array('l', dados['colunas'][dimensao])
+        vendas._receita = array('q', dados['receita'])
+        vendas._lucro = array('q', dados['lucro'])
+        vendas._receita_total = sum(vendas._receita)
+        vendas._lucro_total = sum(vendas._lucro)
+        vendas._instantes = array('d', dados.get('instantes') or bytes(8 * len(vendas._receita)))
+        if 'series' in dados:
+            vendas._series = {nome: SerieTemporal.importar(largura, dados['series'][nome])
+                              for nome, largura in cls.GRANULARIDADES.items()}
+        else:
+            for instante, receita, lucro in zip(vendas._instantes, vendas._receita, vendas._lucro):
+                for serie in vendas._series.values():
+                    serie.acumular(instante, receita, lucro)
+        if 'agregados' in dados:
+            vendas._agregados = {dimensao: {criterio: list(dados['agregados'][dimensao][criterio]) for criterio in cls.CRITERIOS}
+                                 for dimensao in cls.DIMENSOES}
+            vendas._preparar_acumuladores()
+        else:
+            vendas._recalcular_agregados()
+        vendas._ranking_produtos = RankingUnidades.de_contagens(vendas._agregados['produto']['quantidade'])
+        return vendas